@@ -107,7 +107,7 @@ Create:
 3. Fuzz test in {config.rust_dir}/{config.fuzz_dir}/{config.fuzz_targets_dir}/fuzz_{symbol.name}.rs
 
 <fuzzing>
-{load_prompt("example_fuzz_test")}
+{load_prompt("EXAMPLE_FUZZ_TEST")}
 </fuzzing>
 
 <c_declaration>
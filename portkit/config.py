@@ -33,6 +33,9 @@ class ProjectConfig(BaseModel):
     c_files: list[str] = Field(default_factory=list)  # List of C files to compile
     include_dirs: list[str] = Field(default_factory=list)  # Include directories
     compile_flags: list[str] = Field(default_factory=lambda: ["-Wno-unused-function"])
+    # C/header paths (relative to the project root) containing any of these substrings
+    # are not indexed
+    c_ignore_patterns: list[str] = Field(default_factory=lambda: ["png"])
 
     # Metadata
     authors: list[str] = Field(default_factory=list)
@@ -1,5 +1,7 @@
 import asyncio
+import functools
 import json
+import os
 import traceback
 from dataclasses import dataclass
 from enum import Enum
@@ -7,7 +9,7 @@ from pathlib import Path
 from typing import Any
 
 import click
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from rich.console import Console
 
 from portkit import rustc
@@ -89,16 +91,19 @@ class EditorType(str, Enum):
 def load_prompt(name: str) -> str:
     """Load a prompt from the prompts directory."""
     prompt_path = Path(__file__).parent / "prompts" / f"{name}.md"
-    return prompt_path.read_text()
+    return prompt_path.read_bytes().decode("utf-8")
 
 
-UNIFIED_IMPLEMENTATION_PROMPT = f"""
+@functools.cache
+def unified_implementation_prompt() -> str:
+    """Build the unified implementation system prompt on first use."""
+    return f"""
 <instructions>
 {load_prompt("unified_implementation")}
 </instructions>
 
 <fuzzing>
-{load_prompt("example_fuzz_test")}
+{load_prompt("EXAMPLE_FUZZ_TEST")}
 </fuzzing>
 """
 
@@ -116,8 +121,13 @@ class BuilderContext(BaseModel):
 
     running_cost: float = 0.0
 
+    _project_root_str: str = PrivateAttr(default="")
+
     model_config = {"arbitrary_types_allowed": True}
 
+    def model_post_init(self, __context: Any) -> None:
+        self._project_root_str = str(self.project_root)
+
     @classmethod
     def from_project_root(
         cls, project_root: Path, editor_type: EditorType = EditorType.LITELLM
@@ -152,6 +162,12 @@ class BuilderContext(BaseModel):
     def c_source_path(self) -> Path:
         return self.config.c_source_path()
 
+    def relative_to_root(self, path: Path) -> Path:
+        """Return `path` relative to the project root; relative paths pass through."""
+        if not path.is_absolute():
+            return path
+        return Path(os.path.relpath(str(path), self._project_root_str))
+
 
 def has_implementation(symbol_kind: str) -> bool:
     return symbol_kind not in ["struct", "typedef", "enum", "union"]
@@ -245,20 +261,10 @@ def generate_unified_prompt(
     rust_fuzz_path = ctx.rust_fuzz_for_symbol(symbol)
 
     # Convert absolute paths to relative paths from project root
-    rust_src_rel = (
-        rust_src_path.relative_to(ctx.project_root)
-        if rust_src_path.is_absolute()
-        else rust_src_path
-    )
-    rust_ffi_rel = (
-        rust_ffi_path.relative_to(ctx.project_root)
-        if rust_ffi_path.is_absolute()
-        else rust_ffi_path
-    )
-    rust_fuzz_rel = (
-        rust_fuzz_path.relative_to(ctx.project_root)
-        if rust_fuzz_path.is_absolute()
-        else rust_fuzz_path
+    rust_src_rel, rust_ffi_rel, rust_fuzz_rel = (
+        ctx.relative_to_root(rust_src_path),
+        ctx.relative_to_root(rust_ffi_path),
+        ctx.relative_to_root(rust_fuzz_path),
     )
 
     # Get symbol source code using SourceMap
@@ -374,7 +380,7 @@ Repository structure and key symbols:
             "content": [
                 {
                     "type": "text",
-                    "text": UNIFIED_IMPLEMENTATION_PROMPT,
+                    "text": unified_implementation_prompt(),
                     # "cache_control": {"type": "ephemeral"},
                 },
                 {
@@ -0,0 +1,54 @@
+"""Source text of tree-sitter nodes, with an optional cache for one extraction pass."""
+
+import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from tree_sitter import Node
+
+# Decoded node text, keyed by Node.id (unique across live trees, so one cache can span files).
+_node_text_cache: ContextVar[dict[int, str] | None] = ContextVar("_node_text_cache", default=None)
+
+# Identifier-sized texts are interned: they end up as symbol names and dependency keys, and
+# interned strings hash once and compare by identity in the symbol tables.
+_INTERN_MAX_LEN = 64
+
+
+def _decode_node_text(node: Node) -> str:
+    assert node.text is not None
+    text = node.text.decode().strip()
+    if len(text) < _INTERN_MAX_LEN:
+        text = sys.intern(text)
+    return text
+
+
+def node_text(node: Node) -> str:
+    """Return the stripped text of a node, from the active cache if there is one."""
+    cache = _node_text_cache.get()
+    if cache is None:
+        return _decode_node_text(node)
+    text = cache.get(node.id)
+    if text is None:
+        text = cache[node.id] = _decode_node_text(node)
+    return text
+
+
+def node_bytes(node: Node) -> bytes:
+    """Return the stripped source bytes of a node."""
+    assert node.text is not None
+    return node.text.strip()
+
+
+@contextmanager
+def node_text_cache() -> Iterator[None]:
+    """Cache decoded node text until the block exits.
+
+    The trees whose nodes are looked up must stay alive for the whole block, since node ids
+    are only unique among live trees.
+    """
+    token = _node_text_cache.set({})
+    try:
+        yield
+    finally:
+        _node_text_cache.reset(token)
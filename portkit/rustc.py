@@ -3,11 +3,15 @@
 """Routines to map trivial C symbols: enums, constants, and #defines to Rust."""
 
 import re
+import threading
 from pathlib import Path
 
 import tree_sitter_c as tsc
 from tree_sitter import Language, Node, Parser
 
+from portkit.nodetext import node_bytes as _node_bytes
+from portkit.nodetext import node_text as _node_text
+from portkit.nodetext import node_text_cache
 from portkit.sourcemap import Symbol
 
 
@@ -16,39 +20,61 @@ class RustTranscribeError(Exception):
     pass
 
 
-# helper to avoid type-checking warnings
-def _node_text(node: Node) -> str:
-    return node.text.decode().strip()
+_C_LANGUAGE = Language(tsc.language())
+_thread_local = threading.local()
+
+# Matches `name = value` and `*name = value` declarators, or an array declarator.
+_CONST_DECLARATOR_QUERY = _C_LANGUAGE.query(
+    """
+    (init_declarator
+      declarator: [
+        (identifier) @name
+        (pointer_declarator declarator: (identifier) @name)
+        (array_declarator) @array
+      ]
+      value: (_) @value) @init_declarator
+    """
+)
+
+
+def _c_parser() -> Parser:
+    """Return this thread's C parser (tree-sitter parsers are not thread-safe)."""
+    parser = getattr(_thread_local, "c_parser", None)
+    if parser is None:
+        parser = _thread_local.c_parser = Parser(_C_LANGUAGE)
+    return parser
+
+
+_QUAL_RE = re.compile(r'\b(const|static|extern|volatile)\b')
+_WS_RE = re.compile(r'\s+')
+
+# Common type mappings
+_C_TO_RUST_TYPES = {
+    'int': 'i32',
+    'unsigned int': 'u32',
+    'unsigned': 'u32',
+    'char': 'i8',
+    'unsigned char': 'u8',
+    'short': 'i16',
+    'unsigned short': 'u16',
+    'long': 'i64',
+    'unsigned long': 'u64',
+    'long long': 'i64',
+    'unsigned long long': 'u64',
+    'size_t': 'usize',
+    'ptrdiff_t': 'isize',
+    'float': 'f32',
+    'double': 'f64',
+    'bool': 'bool',
+    '_Bool': 'bool',
+}
 
 
 def map_c_type_to_rust(c_type: str) -> str:
     """Map C types to appropriate Rust types."""
     # Remove qualifiers and normalize whitespace
-    c_type = re.sub(r'\b(const|static|extern|volatile)\b', '', c_type).strip()
-    c_type = re.sub(r'\s+', ' ', c_type).strip()
-    
-    # Common type mappings
-    type_map = {
-        'int': 'i32',
-        'unsigned int': 'u32',
-        'unsigned': 'u32',
-        'char': 'i8',
-        'unsigned char': 'u8',
-        'short': 'i16',
-        'unsigned short': 'u16',
-        'long': 'i64',
-        'unsigned long': 'u64',
-        'long long': 'i64',
-        'unsigned long long': 'u64',
-        'size_t': 'usize',
-        'ptrdiff_t': 'isize',
-        'float': 'f32',
-        'double': 'f64',
-        'bool': 'bool',
-        '_Bool': 'bool',
-    }
-    
-    return type_map.get(c_type, c_type)
+    c_type = _WS_RE.sub(' ', _QUAL_RE.sub('', c_type)).strip()
+    return _C_TO_RUST_TYPES.get(c_type, c_type)
 
 
 def extract_define_value_and_type_from_ast(node: Node) -> tuple[str, str]:
@@ -80,88 +106,94 @@ def extract_define_value_and_type_from_ast(node: Node) -> tuple[str, str]:
     raise RustTranscribeError("Complex #define expression with multiple nodes")
 
 
+# A whole C number literal: hex or decimal integer with a complete integer suffix, or a
+# float with an optional `f` suffix. Anything else (expressions, long double, binary or
+# octal-looking oddities) is rejected so the symbol falls back to the agent.
+_NUMBER_LITERAL_RE = re.compile(
+    rb"""(?P<sign>-?)(?:
+        (?P<hex>0[xX](?P<hex_digits>[0-9a-fA-F]+))
+        (?P<hex_suffix>[uU](?:ll|LL|l|L)?|(?:ll|LL|l|L)[uU]?)?
+      | (?P<float>(?:[0-9]+\.[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?|[0-9]+[eE][+-]?[0-9]+)
+        (?P<float_suffix>[fF])?
+      | (?P<dec>[0-9]+)
+        (?P<dec_suffix>[uU](?:ll|LL|l|L)?|(?:ll|LL|l|L)[uU]?)?
+    )""",
+    re.VERBOSE,
+)
+
+# Rust type for each integer suffix, keyed by the lowercased suffix.
+_INTEGER_SUFFIX_TYPES = {
+    b'u': "u32",
+    b'l': "isize",
+    b'ul': "usize",
+    b'lu': "usize",
+    b'll': "i64",
+    b'ull': "u64",
+    b'llu': "u64",
+}
+
+
+def _decimal_fits_u32(digits: bytes) -> bool:
+    """Check an ASCII digit string against u32::MAX without converting it."""
+    digits = digits.lstrip(b'0')
+    return len(digits) < 10 or (len(digits) == 10 and digits <= b'4294967295')
+
+
+def _hex_fits_u32(digits: bytes) -> bool:
+    return len(digits.lstrip(b'0')) <= 8
+
+
+def _classify_numeric(raw: bytes) -> tuple[str, str]:
+    """Classify a C numeric literal (hex, float or integer, with optional suffix)."""
+    match = _NUMBER_LITERAL_RE.fullmatch(raw)
+    if match is None:
+        raise RustTranscribeError(f"Invalid number literal: {raw.decode()}")
+
+    sign = match["sign"]
+    if match["float"]:
+        return (sign + match["float"]).decode(), "f32" if match["float_suffix"] else "f64"
+
+    suffix = match["hex_suffix"] or match["dec_suffix"]
+    if suffix:
+        rust_type = _INTEGER_SUFFIX_TYPES[suffix.lower()]
+        if sign and rust_type.startswith("u"):
+            raise RustTranscribeError(f"Negative unsigned literal: {raw.decode()}")
+        return (sign + (match["hex"] or match["dec"])).decode(), rust_type
+
+    if match["hex"]:
+        if sign:
+            return raw.decode(), "i64"
+        return raw.decode(), "u32" if _hex_fits_u32(match["hex_digits"]) else "u64"
+    return raw.decode(), "u32" if not sign and _decimal_fits_u32(match["dec"]) else "i32"
+
+
 def _extract_preproc_arg_value_and_type(preproc_arg_node: Node) -> tuple[str, str]:
     """Extract value and type from a preproc_arg node."""
     # preproc_arg contains the raw text of the macro value
-    value_text = _node_text(preproc_arg_node)
-
-    # Check string literals first (before checking for dots)
-    if value_text.startswith('"') and value_text.endswith('"'):
-        # String literal
-        return value_text, "&str"
-    elif value_text.startswith("'") and value_text.endswith("'"):
-        # Char literal
-        return value_text, "u8"
-    elif value_text.lower() in ('true', 'false'):
-        return value_text.lower(), "bool"
-    elif value_text.isdigit():
-        # Simple integer
-        val = int(value_text)
-        if 0 <= val <= 4294967295:
-            return value_text, "u32"
-        else:
-            return value_text, "i32"
-    elif value_text.startswith('0x') or value_text.startswith('0X'):
-        # Hex literal
-        try:
-            val = int(value_text, 16)
-            if 0 <= val <= 4294967295:
-                return value_text, "u32"
-            else:
-                return value_text, "u64"
-        except ValueError as e:
-            raise RustTranscribeError(f"Invalid hex literal in preproc_arg: {value_text}") from e
-    elif '.' in value_text or 'e' in value_text.lower():
-        # Float literal (check after string literals)
-        if value_text.endswith(('f', 'F')):
-            return value_text.rstrip('fF'), "f32"
-        else:
-            return value_text, "f64"
-    else:
-        # Could be a complex expression or identifier
-        raise RustTranscribeError(f"Complex or unsupported preproc_arg value: {value_text}")
+    raw = _node_bytes(preproc_arg_node)
+    first = raw[:1]
+
+    if first in (b'"', b"'") and raw.endswith(first):
+        # String or char literal
+        return raw.decode(), "&str" if first == b'"' else "u8"
+    elif first.isdigit() or first == b'.' or (first == b'-' and raw[1:2].isdigit()):
+        return _classify_numeric(raw)
+
+    lowered = raw.lower()
+    if lowered in (b'true', b'false'):
+        return lowered.decode(), "bool"
+    # Could be a complex expression or identifier
+    raise RustTranscribeError(f"Complex or unsupported preproc_arg value: {raw.decode()}")
 
 
 def _extract_literal_value_and_type(node: Node) -> tuple[str, str]:
     """Extract value and type from a single literal node."""
-    node_text = _node_text(node)
-
     if node.type == "number_literal":
-        # Integer literal
-        if node_text.endswith(('u', 'U')):
-            return node_text.rstrip('uU'), "u32"
-        elif node_text.endswith(('ul', 'UL', 'uL', 'Ul')):
-            return node_text.rstrip('ulUL'), "usize"
-        elif node_text.endswith(('l', 'L')):
-            return node_text.rstrip('lL'), "isize"
-        elif node_text.startswith('0x') or node_text.startswith('0X'):
-            # Hex literal
-            try:
-                val = int(node_text, 16)
-                if 0 <= val <= 4294967295:
-                    return node_text, "u32"
-                else:
-                    return node_text, "u64"
-            except ValueError as e:
-                raise RustTranscribeError(f"Invalid hex literal: {node_text}") from e
-        elif '.' in node_text or 'e' in node_text.lower():
-            # Float literal
-            if node_text.endswith(('f', 'F')):
-                return node_text.rstrip('fF'), "f32"
-            else:
-                return node_text, "f64"
-        else:
-            # Plain integer
-            try:
-                val = int(node_text)
-                if 0 <= val <= 4294967295:
-                    return node_text, "u32"
-                else:
-                    return node_text, "i32"
-            except ValueError as e:
-                raise RustTranscribeError(f"Invalid number literal: {node_text}") from e
-
-    elif node.type == "string_literal":
+        # Number literals are ASCII: classify the raw bytes and decode only the result
+        return _classify_numeric(_node_bytes(node))
+
+    node_text = _node_text(node)
+    if node.type == "string_literal":
         return node_text, "&str"
 
     elif node.type == "char_literal":
@@ -184,42 +216,18 @@ def extract_const_declaration_from_ast(node: Node) -> tuple[str, str, str]:
         raise RustTranscribeError(f"Expected declaration node, got {node.type}")
 
     # Find the declarator and initializer
-    name = None
-    value_node = None
-    type_info = None
-
-    def find_declarator_info(n: Node):
-        nonlocal name, value_node, type_info
-
-        if n.type == "init_declarator":
-            # Get the name from array_declarator or identifier
-            for child in n.children:
-                if child.type == "array_declarator":
-                    # Array declaration: type name[size] = {...}
-                    return _extract_array_declaration(child, n)
-                elif child.type == "identifier":
-                    name = _node_text(child)
-                elif child.type == "=":
-                    continue  # Skip assignment operator
-                elif child.type in ("number_literal", "string_literal", "initializer_list"):
-                    value_node = child
-
-        elif n.type == "identifier":
-            name = _node_text(n)
-
-        elif n.type in ("number_literal", "string_literal", "initializer_list"):
-            value_node = n
-
-        # Recursively search children
-        for child in n.children:
-            find_declarator_info(child)
-
-    find_declarator_info(node)
-
-    if not name:
+    matches = _CONST_DECLARATOR_QUERY.matches(node)
+    if not matches:
         raise RustTranscribeError("Cannot find variable name in declaration")
+    captures = matches[0][1]
 
-    if not value_node:
+    if "array" in captures:
+        # Array declaration: type name[size] = {...}
+        return _extract_array_declaration(captures["array"], captures["init_declarator"])
+
+    name = _node_text(captures["name"])
+    value_node = captures["value"]
+    if value_node.type not in ("number_literal", "string_literal"):
         raise RustTranscribeError(f"Cannot find initializer for {name}")
 
     # Extract type from the declaration context
@@ -256,12 +264,11 @@ def _extract_array_declaration(array_declarator: Node, init_declarator: Node) ->
 
     # Count elements and check complexity
     elements = []
-    for child in initializer.children:
-        if child.type == "number_literal":
-            elements.append(_node_text(child))
-        elif child.type != ",":  # Skip commas
+    for element_type, element_text in _initializer_elements(initializer):
+        if element_type != "number_literal":
             # Complex element (expression, etc.)
-            raise RustTranscribeError(f"Complex array element in {name}: {child.type}")
+            raise RustTranscribeError(f"Complex array element in {name}: {element_type}")
+        elements.append(element_text)
 
     if len(elements) > 20:
         raise RustTranscribeError(f"Array {name} has {len(elements)} elements, too complex for direct transpilation")
@@ -282,39 +289,40 @@ def _extract_array_declaration(array_declarator: Node, init_declarator: Node) ->
     return name, rust_type, value_str
 
 
+# One pass over a declaration finds every type keyword; "unsigned long" is listed
+# before "unsigned" and "long" so the longer match wins.
+_TYPE_KEYWORD_RE = re.compile(r'size_t|ptrdiff_t|unsigned long|unsigned|long|int|float|double')
+_TYPE_KEYWORD_PRECEDENCE = (
+    ("size_t", "usize"),
+    ("ptrdiff_t", "isize"),
+    ("unsigned long", "u64"),
+    ("unsigned", "u32"),
+    ("long", "i64"),
+    ("int", "i32"),
+    ("float", "f32"),
+    ("double", "f64"),
+)
+
+
 def _infer_type_from_declaration_and_value(decl_node: Node, value_node: Node) -> str:
     """Infer Rust type from C declaration context and value."""
-    # Look for type information in the declaration node and its parent
-    node_text = _node_text(decl_node)
-
-    # If we're in an init_declarator, check the parent declaration for type info
+    # If we're in an init_declarator, the parent declaration holds the type
     if decl_node.type == "init_declarator" and decl_node.parent:
-        parent_text = _node_text(decl_node.parent)
-        node_text = parent_text
-
-    # Look for C type keywords
-    if "size_t" in node_text:
-        return "usize"
-    elif "ptrdiff_t" in node_text:
-        return "isize"
-    elif "unsigned long" in node_text:
-        return "u64"
-    elif "unsigned" in node_text and "int" in node_text:
-        return "u32"
-    elif "unsigned" in node_text:
-        return "u32"
-    elif "long" in node_text:
-        return "i64"
-    elif "int" in node_text:
-        return "i32"
-    elif "float" in node_text:
-        return "f32"
-    elif "double" in node_text:
-        return "f64"
+        decl_node = decl_node.parent
+
+    # Only the type specifier matters; the initializer may contain keyword-like text
+    type_node = decl_node.child_by_field_name("type")
+    type_text = _node_text(type_node) if type_node else ""
+
+    # Look for C type keywords, in order of precedence
+    found = set(_TYPE_KEYWORD_RE.findall(type_text))
+    for keyword, rust_type in _TYPE_KEYWORD_PRECEDENCE:
+        if keyword in found:
+            return rust_type
 
     # Fall back to inferring from value
     if value_node.type == "number_literal":
-        value_text = value_node.text.decode()
+        value_text = _node_text(value_node)
         if value_text.endswith('u'):
             return "u32"
         elif '.' in value_text:
@@ -328,14 +336,33 @@ def _infer_type_from_declaration_and_value(decl_node: Node, value_node: Node) ->
     return "i32"
 
 
+def _initializer_elements(initializer: Node) -> list[tuple[str, str]]:
+    """Return (node type, text) for each element of an initializer list, skipping punctuation."""
+    # Walk siblings with a cursor and slice element text out of the list's bytes once
+    raw = initializer.text
+    base = initializer.start_byte
+    elements = []
+    cursor = initializer.walk()
+    if cursor.goto_first_child():
+        while True:
+            child = cursor.node
+            if child.type not in ("{", ",", "}"):
+                text = raw[child.start_byte - base : child.end_byte - base].decode().strip()
+                elements.append((child.type, text))
+            if not cursor.goto_next_sibling():
+                break
+    return elements
+
+
 def _extract_value_from_node(value_node: Node) -> str:
     """Extract the value string from an AST node."""
     if value_node.type == "initializer_list":
         # Array initializer
-        elements = []
-        for child in value_node.children:
-            if child.type == "number_literal":
-                elements.append(_node_text(child))
+        elements = [
+            text
+            for element_type, text in _initializer_elements(value_node)
+            if element_type == "number_literal"
+        ]
         return f"[{', '.join(elements)}]"
     else:
         # Simple value
@@ -348,30 +375,29 @@ def _transpile_enum_from_ast(enum_node: Node, enum_name: str) -> str:
         raise RustTranscribeError(f"Expected enum_specifier node, got {enum_node.type}")
     
     # Find the enumerator list
-    enumerator_list = None
-    for child in enum_node.children:
-        if child.type == "enumerator_list":
-            enumerator_list = child
-            break
-    
+    enumerator_list = enum_node.child_by_field_name("body")
     if not enumerator_list:
         raise RustTranscribeError(f"Enum {enum_name} has no enumerator list")
-    
-    # Parse enum variants from AST
+
+    # Parse enum variants from AST, walking the list with a cursor
     variants = []
-    for child in enumerator_list.children:
-        if child.type == "enumerator":
-            variant_info = _parse_enum_variant_from_ast(child)
-            if variant_info:
-                variants.append(variant_info)
+    cursor = enumerator_list.walk()
+    if cursor.goto_first_child():
+        while True:
+            if cursor.node.type == "enumerator":
+                variant_info = _parse_enum_variant_from_ast(cursor.node)
+                if variant_info:
+                    variants.append(variant_info)
+            if not cursor.goto_next_sibling():
+                break
     
     if not variants:
         raise RustTranscribeError(f"Enum {enum_name} has no valid variants")
     
-    variants_str = ',\n'.join(variants)
-    if variants_str:
-        variants_str += ','
-    
+    variants_str = "\n".join(
+        f"    {name} = {value}," if value else f"    {name}," for name, value in variants
+    )
+
     return f"""#[repr(C)]
 #[derive(Debug, Clone, Copy, PartialEq, Eq)]
 pub enum {enum_name} {{
@@ -379,30 +405,65 @@ pub enum {enum_name} {{
 }}"""
 
 
-def _parse_enum_variant_from_ast(enumerator_node: Node) -> str | None:
-    """Parse a single enum variant from an enumerator AST node."""
-    name = None
-    value = None
-
-    for child in enumerator_node.children:
-        if child.type == "identifier":
-            name = _node_text(child)
-        elif child.type == "number_literal":
-            value = _node_text(child)
-        elif child.type in ("unary_expression", "binary_expression"):
-            # Complex expression - bail out
-            raise RustTranscribeError(f"Complex enum value expression: {child.type}")
-
-    if not name:
+def _parse_enum_variant_from_ast(enumerator_node: Node) -> tuple[str, str | None] | None:
+    """Parse a single enum variant into (name, value) from an enumerator AST node."""
+    name_node = enumerator_node.child_by_field_name("name")
+    if not name_node:
         return None
+    name = _node_text(name_node)
 
-    if value:
+    value = None
+    value_node = enumerator_node.child_by_field_name("value")
+    if value_node:
+        if value_node.type != "number_literal":
+            # Complex expression - bail out
+            raise RustTranscribeError(f"Complex enum value expression: {value_node.type}")
+        value = _node_text(value_node)
         # Validate the value is simple
         if not (value.isdigit() or value.startswith('0x') or value.startswith('-')):
             raise RustTranscribeError(f"Complex enum value: {value}")
-        return f"    {name} = {value}"
+    return name, value
+
+
+# Transpiled code keyed by (kind, name, source text), so identical header nodes are only
+# transpiled once without the cache keeping their trees alive.
+_TRANSPILED_MAX = 4096
+_transpiled: dict[tuple[str, str, bytes], str] = {}
+_transpiled_lock = threading.Lock()
+
+
+def _transpile_node(ast_node: Node, kind: str, name: str) -> str:
+    """Transpile an AST node, reusing the result for nodes with identical source."""
+    # A const init_declarator takes its type from the enclosing declaration
+    source_node = ast_node
+    if ast_node.type == "init_declarator" and ast_node.parent:
+        source_node = ast_node.parent
+    key = (kind, name, _node_bytes(source_node))
+
+    with _transpiled_lock:
+        rust_code = _transpiled.get(key)
+    if rust_code is None:
+        rust_code = _transpile_node_uncached(ast_node, kind, name)
+        with _transpiled_lock:
+            if len(_transpiled) >= _TRANSPILED_MAX:
+                _transpiled.clear()
+            _transpiled[key] = rust_code
+    return rust_code
+
+
+def _transpile_node_uncached(ast_node: Node, kind: str, name: str) -> str:
+    if kind == "define":
+        # Handle #define using AST
+        value, rust_type = extract_define_value_and_type_from_ast(ast_node)
+        return f"pub const {name}: {rust_type} = {value};"
+    elif kind == "const":
+        # Handle const declaration using AST
+        name, rust_type, value = extract_const_declaration_from_ast(ast_node)
+        return f"pub const {name}: {rust_type} = {value};"
+    elif kind == "enum":
+        return _transpile_enum_from_ast(ast_node, name)
     else:
-        return f"    {name}"
+        raise RustTranscribeError(f"Cannot transpile symbol of kind: {kind}")
 
 
 def transpile_const(symbol: Symbol) -> str:
@@ -411,18 +472,11 @@ def transpile_const(symbol: Symbol) -> str:
     ast_node = symbol._definition_node or symbol._declaration_node
     if not ast_node:
         raise RustTranscribeError(f"No AST node available for symbol {symbol.name}")
-    
-    if symbol.kind == "define":
-        # Handle #define using AST
-        value, rust_type = extract_define_value_and_type_from_ast(ast_node)
-        return f"pub const {symbol.name}: {rust_type} = {value};"
-    elif symbol.kind == "const":
-        # Handle const declaration using AST
-        name, rust_type, value = extract_const_declaration_from_ast(ast_node)
-        return f"pub const {name}: {rust_type} = {value};"
-    else:
+    if symbol.kind not in ("define", "const"):
         raise RustTranscribeError(f"Cannot transpile symbol of kind: {symbol.kind}")
 
+    return _transpile_node(ast_node, symbol.kind, symbol.name)
+
 
 def transpile_enum(symbol: Symbol) -> str:
     """Transpile a C enum to Rust using AST analysis."""
@@ -431,12 +485,20 @@ def transpile_enum(symbol: Symbol) -> str:
     if not ast_node:
         raise RustTranscribeError(f"No AST node available for enum {symbol.name}")
     
-    return _transpile_enum_from_ast(ast_node, symbol.name)
+    return _transpile_node(ast_node, "enum", symbol.name)
+
+
+_TRANSPILERS = {
+    "const": transpile_const,
+    "define": transpile_const,
+    "enum": transpile_enum,
+}
+_DIRECT_KINDS = frozenset(_TRANSPILERS)
 
 
 def can_transpile_directly(symbol: Symbol) -> bool:
     """Check if a symbol can be directly transpiled without LLM."""
-    return symbol.kind in ("const", "define", "enum")
+    return symbol.kind in _DIRECT_KINDS
 
 
 def transpile(symbol: Symbol, project_root: Path) -> str:  # noqa: ARG001
@@ -453,24 +515,18 @@ def transpile(symbol: Symbol, project_root: Path) -> str:  # noqa: ARG001
     Raises:
         RustTranscribeError: If the symbol cannot be transpiled directly.
     """
-    if not can_transpile_directly(symbol):
+    transpiler = _TRANSPILERS.get(symbol.kind)
+    if transpiler is None:
         raise RustTranscribeError(f"Symbol kind '{symbol.kind}' cannot be transpiled directly")
-    
-    if symbol.kind in ("const", "define"):
-        return transpile_const(symbol)
-    elif symbol.kind == "enum":
-        return transpile_enum(symbol)
-    
-    raise RustTranscribeError(f"No transpilation handler for symbol kind: {symbol.kind}")
+
+    with node_text_cache():
+        return transpiler(symbol)
 
 
 def extract_define_value_and_type(define_text: str) -> tuple[str, str]:
     """Legacy compatibility function for tests that use regex parsing."""
     # Parse the C code to get AST for compatibility
-    language_c = Language(tsc.language())
-    parser = Parser(language_c)
-    
-    tree = parser.parse(define_text.encode())
+    tree = _c_parser().parse(define_text.encode())
     root = tree.root_node
     
     # Find the preproc_def node
@@ -484,10 +540,7 @@ def extract_define_value_and_type(define_text: str) -> tuple[str, str]:
 def extract_const_declaration(decl_text: str) -> tuple[str, str, str]:
     """Legacy compatibility function for tests that use regex parsing."""
     # Parse the C code to get AST for compatibility
-    language_c = Language(tsc.language())
-    parser = Parser(language_c)
-    
-    tree = parser.parse(decl_text.encode())
+    tree = _c_parser().parse(decl_text.encode())
     root = tree.root_node
     
     # Find the declaration node
@@ -500,23 +553,26 @@ def extract_const_declaration(decl_text: str) -> tuple[str, str, str]:
     raise RustTranscribeError(f"Could not parse const declaration: {decl_text}")
 
 
+# Names defined by `pub const NAME` / `pub enum NAME` items in a Rust file.
+_DEFINED_SYMBOL_RE = re.compile(r'\bpub (?:const|enum) (\w+)')
+
+
 def write_transpiled_symbol(symbol: Symbol, rust_code: str, target_file: Path) -> None:
     """Write transpiled Rust code to the target file."""
     target_file.parent.mkdir(parents=True, exist_ok=True)
-    
+
     # Read existing content if file exists
     existing_content = ""
     if target_file.exists():
         existing_content = target_file.read_text()
-    
+
     # Check if symbol already exists in file
-    if f"pub const {symbol.name}" in existing_content or f"pub enum {symbol.name}" in existing_content:
+    if symbol.name in _DEFINED_SYMBOL_RE.findall(existing_content):
         # Symbol already exists, don't duplicate
         return
-    
+
     # Append the new symbol
-    if existing_content and not existing_content.endswith('\n'):
-        existing_content += '\n'
-    
-    new_content = existing_content + rust_code + '\n\n'
-    target_file.write_text(new_content)
+    with open(target_file, "a") as f:
+        if existing_content and not existing_content.endswith('\n'):
+            f.write('\n')
+        f.write(rust_code + '\n\n')
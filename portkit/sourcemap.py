@@ -3,74 +3,105 @@
 # type: ignore[missing-attribute]
 
 import csv
+import os
 import re
 import sys
+import threading
 from collections import defaultdict, deque
-from dataclasses import dataclass, field
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from io import StringIO
+from itertools import groupby
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 import tree_sitter_c as tsc
 import tree_sitter_rust as tsrust
 from pydantic import BaseModel
-from tree_sitter import Language, Node, Parser
+from tree_sitter import Language, Node, Parser, Query, Tree
+
+from portkit.nodetext import node_text as _node_text
+from portkit.nodetext import node_text_cache
 
 if TYPE_CHECKING:
     from portkit.config import ProjectConfig
 
 
-# Helper to avoid type-checking warnings.
-def _node_text(node: Node) -> str:
-    assert node.text is not None
-    return node.text.decode().strip()
-
-
 def detect_strongly_connected_components(
     symbols_by_name: dict, get_dependencies_fn
 ) -> list[set[str]]:
     """Use Tarjan's algorithm to find strongly connected components."""
-    index_counter = [0]
+    # Work on dense integer ids so the bookkeeping is list indexing, not string hashing.
+    # The graph is flattened into CSR form: v's dependencies are indices[indptr[v]:indptr[v + 1]].
+    names = list(symbols_by_name)
+    id_of = {name: i for i, name in enumerate(names)}
+    n = len(names)
+    indptr = [0]
+    indices = []
+    for name in names:
+        indices.extend(id_of[dep] for dep in get_dependencies_fn(name) if dep in id_of)
+        indptr.append(len(indices))
+
+    next_index = 0
     stack = []
-    lowlinks = {}
-    index = {}
-    on_stack = {}
+    lowlinks = [-1] * n
+    index = [-1] * n
+    on_stack = bytearray(n)
     result = []
 
-    def strongconnect(node):
-        index[node] = index_counter[0]
-        lowlinks[node] = index_counter[0]
-        index_counter[0] += 1
-        stack.append(node)
-        on_stack[node] = True
-
-        for dep in get_dependencies_fn(node):
-            if dep in symbols_by_name:
-                if dep not in index:
-                    strongconnect(dep)
-                    lowlinks[node] = min(lowlinks[node], lowlinks[dep])
-                elif on_stack.get(dep, False):
-                    lowlinks[node] = min(lowlinks[node], index[dep])
-
-        # If node is a root node, pop the stack and create an SCC
-        if lowlinks[node] == index[node]:
-            component = set()
-            while True:
-                w = stack.pop()
-                on_stack[w] = False
-                component.add(w)
-                if w == node:
+    for root in range(n):
+        if index[root] != -1:
+            continue
+
+        # Iterative DFS: each frame is [node, position of its next dependency in indices]
+        index[root] = lowlinks[root] = next_index
+        next_index += 1
+        stack.append(root)
+        on_stack[root] = 1
+        work = [[root, indptr[root]]]
+
+        while work:
+            frame = work[-1]
+            node, k = frame
+            end = indptr[node + 1]
+            while k < end:
+                dep = indices[k]
+                k += 1
+                if index[dep] == -1:
+                    index[dep] = lowlinks[dep] = next_index
+                    next_index += 1
+                    stack.append(dep)
+                    on_stack[dep] = 1
+                    frame[1] = k
+                    work.append([dep, indptr[dep]])
                     break
-            result.append(component)
-
-    for node in symbols_by_name:
-        if node not in index:
-            strongconnect(node)
+                elif on_stack[dep]:
+                    lowlinks[node] = min(lowlinks[node], index[dep])
+            else:
+                # All dependencies visited: pop the frame and propagate to the parent
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlinks[parent] = min(lowlinks[parent], lowlinks[node])
+
+                # If node is a root node, pop the stack and create an SCC
+                if lowlinks[node] == index[node]:
+                    component = set()
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = 0
+                        component.add(names[w])
+                        if w == node:
+                            break
+                    result.append(component)
 
     return result
 
 
 # Constants for header guard detection
+_HEADER_GUARD_RE = re.compile(r"(?=__).*(?<=__)|.*_H(?:PP)?_{0,2}")
+
 COMMON_IGNORE_PATTERNS = {
     # Version checks
     "_MSC_VER",
@@ -111,7 +142,7 @@ IGNORE_SUFFIXES = (
 )
 
 # Built-in types to ignore during dependency extraction
-BUILT_IN_C_TYPES = {
+BUILT_IN_C_TYPES = frozenset({
     "assert",
     "int",
     "char",
@@ -133,9 +164,9 @@ BUILT_IN_C_TYPES = {
     "bool",
     "_Bool",
     "FILE",
-}
+})
 
-BUILT_IN_RUST_TYPES = {
+BUILT_IN_RUST_TYPES = frozenset({
     "u8",
     "u16",
     "u32",
@@ -153,9 +184,9 @@ BUILT_IN_RUST_TYPES = {
     "Vec",
     "Option",
     "Result",
-}
+})
 
-C_KEYWORDS = {
+C_KEYWORDS = frozenset({
     "auto",
     "break",
     "case",
@@ -192,30 +223,27 @@ C_KEYWORDS = {
     "while",
     "inline",
     "restrict",
-}
+})
 
 ALL_BUILT_IN_TYPES = BUILT_IN_C_TYPES | BUILT_IN_RUST_TYPES
 
+# Built-in types and keywords, merged so should_skip needs a single lookup
+_SKIP_NAMES = ALL_BUILT_IN_TYPES | C_KEYWORDS
+
 
 def should_skip(name: str, built_in_types: set[str]) -> bool:
     """Check if a symbol name is meaningless or should be filtered out.
     
     Combines logic for filtering built-in types, keywords, and other invalid symbols.
     """
-    # Filter out built-in types
-    if name in built_in_types:
-        return True
-
-    # Filter out built-in C types specifically
-    if name in BUILT_IN_C_TYPES:
+    # Filter out very short names (likely noise)
+    if len(name) <= 1:
         return True
 
-    # Filter out C keywords
-    if name in C_KEYWORDS:
+    # Filter out built-in types and C keywords
+    if name in _SKIP_NAMES:
         return True
-
-    # Filter out very short names (likely noise)
-    if len(name) <= 1:
+    if built_in_types is not ALL_BUILT_IN_TYPES and name in built_in_types:
         return True
 
     # Filter out common macro patterns
@@ -296,7 +324,7 @@ def create_simple_symbol(
         kind=kind,
         language=language,
         signature=signature,
-        type_dependencies=type_deps or set(),
+        type_dependencies=type_deps or _NO_DEPENDENCIES,
     )
 
     if is_definition:
@@ -318,6 +346,7 @@ def extract_simple_c_symbol_info(
     file_path: Path,
     project_root: Path,
     built_in_types: set[str],
+    is_definition: bool | None = None,
 ) -> tuple[str, str, int, bool, set[str]] | None:
     """Extract common info for simple C symbols (struct, enum)."""
     name_node = find_node_by_type(node, "type_identifier")
@@ -327,7 +356,8 @@ def extract_simple_c_symbol_info(
     name = _node_text(name_node)
     signature = extract_signature(code, node)
     line_num = name_node.start_point[0] + 1
-    is_definition = file_path.suffix != ".h"
+    if is_definition is None:
+        is_definition = file_path.suffix != ".h"
 
     # Extract type dependencies if needed
     type_deps = set()
@@ -337,24 +367,35 @@ def extract_simple_c_symbol_info(
     return name, signature, line_num, is_definition, type_deps
 
 
+_BLOCK_COMMENT_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+_LINE_COMMENT_RE = re.compile(r"//.*$", re.MULTILINE)
+_STRUCT_NAME_RE = re.compile(r"struct\s+(\w+)")
+# Any primitive type name as a substring, found in a single scan of the typedef text
+_PRIMITIVE_TYPE_RE = re.compile(r"int|char|float|double|void")
+
+# Node types whose signature stops at the opening brace of the body
+_FUNCTION_SIGNATURE_TYPES = frozenset(
+    {"function_definition", "declaration", "function_item", "function_signature_item"}
+)
+
+
 def extract_signature(code: bytes, node: Node) -> str:
     """Extract a clean signature from a node."""
     node_text = _node_text(node)
 
     # Remove comments
-    node_text = re.sub(r"/\*.*?\*/", "", node_text, flags=re.DOTALL)
-    node_text = re.sub(r"//.*$", "", node_text, flags=re.MULTILINE)
-
-    # Clean up whitespace
-    lines = [line.strip() for line in node_text.split("\n") if line.strip()]
+    node_text = _BLOCK_COMMENT_RE.sub("", node_text)
+    node_text = _LINE_COMMENT_RE.sub("", node_text)
 
     # For functions, extract just the declaration part
-    if node.type in [
-        "function_definition",
-        "declaration",
-        "function_item",
-        "function_signature_item",
-    ]:
+    if node.type in _FUNCTION_SIGNATURE_TYPES:
+        # Nothing past the line that opens the body is used, so don't split the body
+        brace = node_text.find("{")
+        if brace != -1:
+            line_end = node_text.find("\n", brace)
+            if line_end != -1:
+                node_text = node_text[:line_end]
+        lines = [line.strip() for line in node_text.split("\n") if line.strip()]
         signature_lines = []
         for line in lines:
             signature_lines.append(line)
@@ -365,6 +406,9 @@ def extract_signature(code: bytes, node: Node) -> str:
                 break
         return " ".join(signature_lines)
 
+    # Clean up whitespace
+    lines = [line.strip() for line in node_text.split("\n") if line.strip()]
+
     # For other types, limit to reasonable size
     if len(lines) > 4:
         return "\n".join(lines[:3] + ["..."])
@@ -372,50 +416,65 @@ def extract_signature(code: bytes, node: Node) -> str:
         return "\n".join(lines)
 
 
+def walk_nodes(root: Node) -> Iterator[Node]:
+    """Yield root and all of its descendants in depth-first pre-order, without recursion."""
+    # A TreeCursor moves in C and never builds the per-node children lists
+    cursor = root.walk()
+    while True:
+        yield cursor.node
+        if cursor.goto_first_child():
+            continue
+        while not cursor.goto_next_sibling():
+            # The cursor cannot leave the subtree it was created on
+            if not cursor.goto_parent():
+                return
+
+
 def find_node_by_type(node: Node, node_type: str) -> Node | None:
     """Find first child node of given type."""
-    if node.type == node_type:
-        return node
-    for child in node.children:
-        result = find_node_by_type(child, node_type)
-        if result:
-            return result
-    return None
+    # Same pre-order walk as walk_nodes, inlined: this runs once or more per symbol
+    cursor = node.walk()
+    while True:
+        current = cursor.node
+        if current.type == node_type:
+            return current
+        if cursor.goto_first_child():
+            continue
+        while not cursor.goto_next_sibling():
+            if not cursor.goto_parent():
+                return None
 
 
 def find_function_name_node(node: Node) -> Node | None:
     """Find the function name identifier node."""
-
-    def find_identifier(n: Node) -> Node | None:
-        if n.type == "identifier":
-            return n
-        for child in n.children:
-            result = find_identifier(child)
-            if result:
-                return result
-        return None
-
     # Look for function_declarator first
     for child in node.children:
         if child.type == "function_declarator":
-            return find_identifier(child)
+            return find_node_by_type(child, "identifier")
 
-    return find_identifier(node)
+    return find_node_by_type(node, "identifier")
 
 
-def extract_generic_type_dependencies(node: Node, built_in_types: set[str]) -> set[str]:
-    """Extract type dependencies for functions (C and Rust)."""
-    deps = set()
+def _type_identifier_nodes(node: Node, type_query: Query | None) -> Iterator[Node]:
+    """Yield type_identifier nodes under node, via type_query when one is given."""
+    if type_query is not None:
+        for n, _ in type_query.captures(node):
+            yield n
+    else:
+        for n in walk_nodes(node):
+            if n.type == "type_identifier":
+                yield n
 
-    def extract_type_names(n: Node):
-        if n.type == "type_identifier":
-            type_name = _node_text(n)
-            if not should_skip(type_name, built_in_types):
-                deps.add(type_name)
-        for child in n.children:
-            extract_type_names(child)
 
-    extract_type_names(node)
+def extract_generic_type_dependencies(
+    node: Node, built_in_types: set[str], type_query: Query | None = None
+) -> set[str]:
+    """Extract type dependencies for functions (C and Rust)."""
+    deps = set()
+    for n in _type_identifier_nodes(node, type_query):
+        type_name = _node_text(n)
+        if not should_skip(type_name, built_in_types):
+            deps.add(type_name)
     return deps
 
 
@@ -424,18 +483,13 @@ def extract_field_type_dependencies(
 ) -> set[str]:
     """Extract type dependencies from struct/enum fields."""
     deps = set()
-
-    def extract_field_types(n: Node):
+    for n in walk_nodes(node):
         if n.type == field_node_type:
             for child in n.children:
                 if child.type == "type_identifier":
                     type_name = _node_text(child)
                     if not should_skip(type_name, built_in_types):
                         deps.add(type_name)
-        for child in n.children:
-            extract_field_types(child)
-
-    extract_field_types(node)
     return deps
 
 
@@ -457,19 +511,17 @@ def is_c_function_static(node: Node) -> bool:
     return find_static(node)
 
 
-def extract_typedef_type_dependencies(node: Node, built_in_types: set[str]) -> set[str]:
+def extract_typedef_type_dependencies(
+    node: Node, built_in_types: set[str], type_query: Query | None = None
+) -> set[str]:
     """Extract type dependencies from C typedef, excluding the typedef name itself."""
     deps = set()
-
-    def extract_types(n: Node):
-        if n.type == "type_identifier" and n != node.children[-1]:
+    typedef_name_node = node.children[-1]
+    for n in _type_identifier_nodes(node, type_query):
+        if n != typedef_name_node:
             type_name = _node_text(n)
             if not should_skip(type_name, built_in_types):
                 deps.add(type_name)
-        for child in n.children:
-            extract_types(child)
-
-    extract_types(node)
     return deps
 
 
@@ -482,7 +534,7 @@ def is_simple_typedef(node: Node) -> bool:
     - typedef struct _Name Name (forward declaration without body)
     """
     try:
-        node_text = _node_text(node).strip()
+        node_text = _node_text(node)
 
         # Skip if this typedef has a struct/enum body (indicated by braces)
         if "{" in node_text and "}" in node_text:
@@ -496,18 +548,14 @@ def is_simple_typedef(node: Node) -> bool:
         if "struct" in node_text and "{" not in node_text:
             return True
 
-        # Find all type identifiers and primitive types
+        # Find type identifiers and primitive types; only "exactly two" vs "one or fewer"
+        # matters below, so stop as soon as a third one shows up
         all_types = []
-
-        def find_types(n: Node):
-            if n.type == "type_identifier":
+        for n in walk_nodes(node):
+            if n.type == "type_identifier" or n.type == "primitive_type":
                 all_types.append(_node_text(n))
-            elif n.type == "primitive_type":
-                all_types.append(_node_text(n))
-            for child in n.children:
-                find_types(child)
-
-        find_types(node)
+                if len(all_types) > 2:
+                    break
 
         # Simple type alias: typedef PrimitiveType TypeAlias or typedef Type Type
         if len(all_types) == 2:
@@ -531,6 +579,10 @@ def is_simple_typedef(node: Node) -> bool:
     return False
 
 
+# C symbol kinds that take part in the porting order
+_TOPO_SORT_KINDS = frozenset({"function", "struct", "enum", "const", "define", "typedef"})
+
+
 class SymbolInfo(BaseModel):
     """Information about all locations where a symbol exists."""
 
@@ -541,7 +593,11 @@ class SymbolInfo(BaseModel):
     c_source_path: str | None = None
 
 
-@dataclass
+# Shared default for dependency sets; symbols that never gain dependencies keep it
+_NO_DEPENDENCIES: frozenset[str] = frozenset()
+
+
+@dataclass(slots=True)
 class Symbol:
     """Unified symbol representation for C and Rust."""
 
@@ -557,9 +613,9 @@ class Symbol:
     definition_line: int | None = None
 
     # Dependencies (computed lazily)
-    type_dependencies: set[str] = field(default_factory=set)
-    call_dependencies: set[str] = field(default_factory=set)
-    transitive_dependencies: set[str] = field(default_factory=set)
+    type_dependencies: set[str] | frozenset[str] = _NO_DEPENDENCIES
+    call_dependencies: set[str] | frozenset[str] = _NO_DEPENDENCIES
+    transitive_dependencies: set[str] | frozenset[str] = _NO_DEPENDENCIES
 
     # Analysis metadata
     is_cycle: bool = False
@@ -571,6 +627,7 @@ class Symbol:
     _declaration_node: Any = None
     _definition_node: Any = None
     _depth: int = 0  # Depth in dependency graph
+    _has_body: bool | None = None  # Cached has_struct_body() result
 
     def __hash__(self):
         return hash((self.name, self.kind, self.language))
@@ -598,12 +655,12 @@ class Symbol:
         return self.definition_file
 
     @property
-    def all_dependencies(self) -> set[str]:
+    def all_dependencies(self) -> set[str] | frozenset[str]:
         """Get all dependencies (type + call + transitive)."""
         return self.type_dependencies | self.call_dependencies | self.transitive_dependencies
 
     @property
-    def dependencies(self) -> set[str]:
+    def dependencies(self) -> set[str] | frozenset[str]:
         """Backwards compatibility alias for all_dependencies."""
         return self.all_dependencies
 
@@ -642,15 +699,17 @@ class Symbol:
             self.declaration_file = other.declaration_file
             self.declaration_line = other.declaration_line
             self._declaration_node = other._declaration_node
+            self._has_body = None
         if other.definition_file and not self.definition_file:
             self.definition_file = other.definition_file
             self.definition_line = other.definition_line
             self._definition_node = other._definition_node
+            self._has_body = None
 
-        # Merge dependencies
-        self.type_dependencies.update(other.type_dependencies)
-        self.call_dependencies.update(other.call_dependencies)
-        self.transitive_dependencies.update(other.transitive_dependencies)
+        # Merge dependencies; |= rebinds when the target is still the shared frozenset
+        self.type_dependencies |= other.type_dependencies
+        self.call_dependencies |= other.call_dependencies
+        self.transitive_dependencies |= other.transitive_dependencies
 
         # Merge metadata
         self.is_static = self.is_static or other.is_static
@@ -658,7 +717,9 @@ class Symbol:
         self.reference_count += other.reference_count
 
 
-def find_unification_candidate(typedef_symbol: Symbol, symbols_by_name: dict) -> Symbol | None:
+def find_unification_candidate(
+    typedef_symbol: Symbol, symbols_by_kind: dict[tuple[str, str, str], Symbol]
+) -> Symbol | None:
     """Find struct that should be unified with this typedef.
 
     Looks for patterns like:
@@ -668,72 +729,46 @@ def find_unification_candidate(typedef_symbol: Symbol, symbols_by_name: dict) ->
     if typedef_symbol.kind != "struct" and typedef_symbol.kind != "typedef":
         return None
 
+    def struct_with_body(name: str) -> Symbol | None:
+        candidate = symbols_by_kind.get((name, "struct", "c"))
+        if candidate is not None and candidate != typedef_symbol and has_struct_body(candidate):
+            return candidate
+        return None
+
     typedef_name = typedef_symbol.name
 
     # Look for matching struct definitions
     # Pattern 1: typedef Name matches struct _Name
-    underscore_name = f"_{typedef_name}"
-    if underscore_name in symbols_by_name:
-        for candidate in symbols_by_name[underscore_name]:
-            if (
-                candidate.language == "c"
-                and candidate.kind == "struct"
-                and candidate != typedef_symbol
-                and has_struct_body(candidate)
-            ):  # Has actual struct body
-                return candidate
+    candidate = struct_with_body(f"_{typedef_name}")
+    if candidate:
+        return candidate
 
     # Pattern 2: typedef _Name matches struct _Name (same name)
-    if typedef_name in symbols_by_name:
-        for candidate in symbols_by_name[typedef_name]:
-            if (
-                candidate.language == "c"
-                and candidate.kind == "struct"
-                and candidate != typedef_symbol
-                and has_struct_body(candidate)
-            ):  # Has actual struct body
-                return candidate
+    candidate = struct_with_body(typedef_name)
+    if candidate:
+        return candidate
 
     # Pattern 3: Look through ALL struct symbols to find typedef references in their AST
     # This handles cases like: struct _xmlXIncludeRef + typedef struct _xmlXIncludeRef xmlXIncludeDoc
     typedef_node = typedef_symbol._definition_node or typedef_symbol._declaration_node
-    if typedef_node and "struct" in _node_text(typedef_node):
+    if typedef_node:
         # Extract the struct name from the typedef (the name after 'struct')
-        import re
-
-        typedef_text = _node_text(typedef_node)
-        match = re.search(r"struct\s+(\w+)", typedef_text)
+        match = _STRUCT_NAME_RE.search(_node_text(typedef_node))
         if match:
-            struct_name = match.group(1)
-            if struct_name in symbols_by_name:
-                for candidate in symbols_by_name[struct_name]:
-                    if (
-                        candidate.language == "c"
-                        and candidate.kind == "struct"
-                        and candidate != typedef_symbol
-                        and has_struct_body(candidate)
-                    ):
-                        return candidate
+            return struct_with_body(match.group(1))
 
     return None
 
 
 def has_struct_body(symbol: Symbol) -> bool:
     """Check if a struct symbol has an actual body (field declarations)."""
-    node = symbol._definition_node or symbol._declaration_node
-    if not node:
-        return False
+    if symbol._has_body is not None:
+        return symbol._has_body
 
-    # Check for field_declaration_list recursively in case it's nested
-    def find_field_list(n):
-        if n.type == "field_declaration_list":
-            return True
-        for child in n.children:
-            if find_field_list(child):
-                return True
-        return False
-
-    return find_field_list(node)
+    node = symbol._definition_node or symbol._declaration_node
+    # Check for field_declaration_list anywhere below in case it's nested
+    symbol._has_body = bool(node) and find_node_by_type(node, "field_declaration_list") is not None
+    return symbol._has_body
 
 
 def unify_struct_typedef(struct_symbol: Symbol, typedef_symbol: Symbol) -> Symbol:
@@ -772,6 +807,31 @@ def unify_struct_typedef(struct_symbol: Symbol, typedef_symbol: Symbol) -> Symbo
     return unified
 
 
+# Directories that never hold project sources (VCS metadata, build output)
+_PRUNED_DIRS = frozenset({".git", "target", "node_modules"})
+
+
+def iter_source_files(root: Path, c_ignore_patterns: Iterable[str]) -> Iterator[Path]:
+    """Yield C and Rust source files under root.
+
+    C sources and headers whose path relative to root contains any of c_ignore_patterns
+    are skipped.
+    """
+    c_ignore_patterns = tuple(c_ignore_patterns)
+    # Patterns must not match the root itself (e.g. a temporary directory named "tmpng...")
+    root_prefix_len = len(os.path.join(root, ""))
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in _PRUNED_DIRS]
+        for filename in filenames:
+            if filename.endswith((".c", ".h")):
+                path = os.path.join(dirpath, filename)
+                relpath = path[root_prefix_len:]
+                if not any(pattern in relpath for pattern in c_ignore_patterns):
+                    yield Path(path)
+            elif filename.endswith(".rs"):
+                yield Path(dirpath, filename)
+
+
 class SourceMap:
     """Unified source map for C and Rust symbols with dependency analysis."""
 
@@ -784,18 +844,55 @@ class SourceMap:
         self.rust_language = Language(tsrust.language())
         self.c_parser = Parser(self.c_language)
         self.rust_parser = Parser(self.rust_language)
+        # Queries run in tree-sitter's C code; captures come back in document order
+        self._c_symbol_query = self.c_language.query(
+            "[" + " ".join(f"({node_type})" for node_type in self._C_NODE_HANDLERS) + "] @node"
+        )
+        self._rust_symbol_query = self.rust_language.query(
+            "[" + " ".join(f"({node_type})" for node_type in self._RUST_NODE_EXTRACTORS) + "] @node"
+        )
+        self._c_call_query = self.c_language.query(
+            "(call_expression function: (identifier) @callee)"
+        )
+        # Plain calls and method calls (the field name of a field_expression callee)
+        self._rust_call_query = self.rust_language.query(
+            """(call_expression function: [
+                (identifier) @callee
+                (field_expression field: (field_identifier) @callee)
+            ])"""
+        )
+        self._c_type_query = self.c_language.query("(type_identifier) @type")
+        self._rust_type_query = self.rust_language.query("(type_identifier) @type")
+        # Parsers are not thread-safe; worker threads each get their own
+        self._thread_parsers = threading.local()
+        # Source bytes each file's tree was parsed from, for source lookups after init
+        self._file_sources: dict[Path, bytes] = {}
+        # Bytes of files read for lookups but never parsed, with their (mtime_ns, size)
+        self._unparsed_sources: dict[Path, tuple[tuple[int, int], bytes]] = {}
+        # Project-relative path per file; every symbol from a file shares one
+        self._relpath_cache: dict[Path, Path] = {}
+        # Fuzz test file -> ((mtime_ns, size), content or None without a fuzz target)
+        self._fuzz_test_cache: dict[Path, tuple[tuple[int, int], str | None]] = {}
 
         # Core symbol storage (using composite key to allow same name in different languages)
         self.symbols: dict[tuple[str, str], Symbol] = {}  # (name, language) -> Symbol
         self.symbols_by_name: dict[str, list[Symbol]] = {}  # name -> list of symbols
+        self.symbols_by_kind: dict[tuple[str, str, str], Symbol] = {}  # (name, kind, language)
+        # language -> name -> Symbol, so per-language passes skip the other language
+        self.symbols_by_language: dict[str, dict[str, Symbol]] = {"c": {}, "rust": {}}
         self.call_graph: dict[str, set[str]] = {}
+        # Bumped whenever symbols or their dependency/cycle data change
+        self._symbols_version = 0
+        self._repomap_cache: tuple[int, str] | None = None
 
         # Built-in types to ignore
         self.built_in_types = ALL_BUILT_IN_TYPES
 
         # Parse all files immediately at initialization
         self._parse_all_files()
-        self._unify_struct_typedefs()
+        # Unification re-reads typedef/struct text from every file; share one cache for the pass
+        with node_text_cache():
+            self._unify_struct_typedefs()
         # Skip transitive dependency resolution since we only output direct dependencies
 
     def parse_project(self) -> list[Symbol]:
@@ -804,157 +901,152 @@ class SourceMap:
 
     def _parse_all_files(self):
         """Find and parse all relevant source files."""
-        for file_path in self.project_root.rglob("*"):
-            if file_path.is_file():
-                if file_path.suffix in [".c", ".h"]:
-                    if "png" not in str(file_path):
-                        self._parse_c_file(file_path)
-                elif file_path.suffix == ".rs":
-                    self._parse_rust_file(file_path)
-
-    def _parse_c_file(self, file_path: Path):
+        files = list(iter_source_files(self.project_root, self.config.c_ignore_patterns))
+
+        # Read and parse files on a thread pool; symbol extraction stays on this thread
+        # (in file order) because it mutates the shared symbol tables.
+        with ThreadPoolExecutor() as executor:
+            futures = [executor.submit(self._read_and_parse, file_path) for file_path in files]
+            for file_path, future in zip(files, futures, strict=True):
+                if file_path.suffix == ".rs":
+                    self._parse_rust_file(file_path, future)
+                else:
+                    self._parse_c_file(file_path, future)
+
+    def _read_and_parse(self, file_path: Path) -> tuple[bytes, Tree]:
+        """Read a source file and parse it with this thread's parser for its language."""
+        parsers = getattr(self._thread_parsers, "parsers", None)
+        if parsers is None:
+            parsers = self._thread_parsers.parsers = {
+                "c": Parser(self.c_language),
+                "rust": Parser(self.rust_language),
+            }
+        code = file_path.read_bytes()
+        return code, parsers["rust" if file_path.suffix == ".rs" else "c"].parse(code)
+
+    def _source_bytes(self, file_path: Path) -> bytes:
+        """Return the bytes a file was parsed from, reading it only if it was never parsed."""
+        code = self._file_sources.get(file_path)
+        if code is not None:
+            return code
+
+        # Files outside the parse are reread only when they change on disk
+        st = file_path.stat()
+        stat = (st.st_mtime_ns, st.st_size)
+        cached = self._unparsed_sources.get(file_path)
+        if cached is None or cached[0] != stat:
+            cached = (stat, file_path.read_bytes())
+            self._unparsed_sources[file_path] = cached
+        return cached[1]
+
+    def _parse_c_file(self, file_path: Path, parsed: Future[tuple[bytes, Tree]] | None = None):
         """Parse a C file and extract symbols."""
+        # Fresh text cache per file keeps memory bounded to one file's nodes
         try:
-            code = file_path.read_bytes()
-            tree = self.c_parser.parse(code)
+            if parsed is not None:
+                code, tree = parsed.result()
+            else:
+                code = file_path.read_bytes()
+                tree = self.c_parser.parse(code)
+            self._file_sources[file_path] = code
 
-            self._traverse_c_node(tree.root_node, file_path, code)
+            with node_text_cache():
+                self._extract_c_symbols(tree.root_node, file_path, code, file_path.suffix == ".h")
 
         except Exception as e:
             print(f"Warning: Failed to parse C file {file_path}: {e}")
 
-    def _parse_rust_file(self, file_path: Path):
+    def _parse_rust_file(
+        self, file_path: Path, parsed: Future[tuple[bytes, Tree]] | None = None
+    ):
         """Parse a Rust file and extract symbols."""
         try:
-            code = file_path.read_bytes()
-            tree = self.rust_parser.parse(code)
+            if parsed is not None:
+                code, tree = parsed.result()
+            else:
+                code = file_path.read_bytes()
+                tree = self.rust_parser.parse(code)
+            self._file_sources[file_path] = code
 
-            self._traverse_rust_node(tree.root_node, file_path, code)
+            with node_text_cache():
+                self._extract_rust_symbols(tree.root_node, file_path, code)
 
         except Exception as e:
             print(f"Warning: Failed to parse Rust file {file_path}: {e}")
 
-    def _traverse_c_node(self, node: Node, file_path: Path, code: bytes):
-        """Traverse C AST and extract symbols."""
-        name = _node_text(node)
-        if should_skip(name, self.built_in_types):
-            return
-
-        if node.type == "function_definition":
-            symbol = self._extract_c_function(node, file_path, code, is_definition=True)
-            if symbol:
-                self._add_or_merge_symbol(symbol)
-                # Extract call dependencies for function bodies
-                calls = self._find_c_function_calls(node, code)
-                self.call_graph[symbol.name] = calls
-
-        elif node.type == "declaration":
-            # Check if it's a function declaration
-            for child in node.children:
-                if child.type == "function_declarator":
-                    symbol = self._extract_c_function(node, file_path, code, is_definition=False)
-                    if symbol:
-                        self._add_or_merge_symbol(symbol)
-                    break
-
-        elif node.type == "struct_specifier":
-            symbol = self._extract_c_struct(node, file_path, code)
-            if symbol:
-                self._add_or_merge_symbol(symbol)
-
-        elif node.type == "enum_specifier":
-            symbol = self._extract_c_enum(node, file_path, code)
-            if symbol:
-                self._add_or_merge_symbol(symbol)
-
-        elif node.type == "type_definition":
-            symbol = self._extract_c_typedef(node, file_path, code)
-            if symbol:
-                self._add_or_merge_symbol(symbol)
-
-        # Handle typedef struct patterns
-        elif node.type == "declaration" and self._is_typedef_struct(node):
-            symbol = self._extract_c_typedef_struct(node, file_path, code)
-            if symbol:
-                self._add_or_merge_symbol(symbol)
-
-        elif node.type == "preproc_def" and file_path.suffix == ".h":
-            symbol = self._extract_c_define(node, file_path, code)
-            if symbol:
-                self._add_or_merge_symbol(symbol)
-
-        elif node.type == "preproc_function_def" and file_path.suffix == ".h":
-            symbol = self._extract_c_function_like_macro(node, file_path, code)
-            if symbol:
-                self._add_or_merge_symbol(symbol)
-                # Extract call dependencies for function-like macros
-                calls = self._find_c_function_calls(node, code)
-                self.call_graph[symbol.name] = calls
-
-        elif node.type == "init_declarator" and self._is_top_level_constant(node):
-            symbol = self._extract_c_constant(node, file_path, code)
-            if symbol:
-                self._add_or_merge_symbol(symbol)
-
-        elif node.type == "declaration" and self._is_constant_declaration(node):
-            symbol = self._extract_c_constant_declaration(node, file_path, code)
-            if symbol:
-                self._add_or_merge_symbol(symbol)
-
-        # Recurse to children
-        for child in node.children:
-            self._traverse_c_node(child, file_path, code)
-
-    def _traverse_rust_node(self, node: Node, file_path: Path, code: bytes):
-        """Traverse Rust AST and extract symbols."""
-        if node.type == "function_item":
-            symbol = self._extract_rust_function(node, file_path, code)
-            if symbol:
-                self._add_or_merge_symbol(symbol)
-                # Extract call dependencies
-                calls = self._find_rust_function_calls(node, code)
-                self.call_graph[symbol.name] = calls
-
-        elif node.type == "struct_item":
-            symbol = self._extract_rust_struct(node, file_path, code)
-            if symbol:
-                self._add_or_merge_symbol(symbol)
-
-        elif node.type == "enum_item":
-            symbol = self._extract_rust_enum(node, file_path, code)
-            if symbol:
-                self._add_or_merge_symbol(symbol)
-
-        elif node.type == "const_item":
-            symbol = self._extract_simple_rust_symbol(node, file_path, code, "const")
-            if symbol:
-                self._add_or_merge_symbol(symbol)
+    def _add_symbol(self, symbol: Symbol | None) -> Symbol | None:
+        """Add an extracted symbol unless it is missing or names a built-in/keyword."""
+        if not symbol or should_skip(symbol.name, self.built_in_types):
+            return None
+        self._add_or_merge_symbol(symbol)
+        return symbol
 
-        elif node.type == "static_item":
-            symbol = self._extract_simple_rust_symbol(node, file_path, code, "static")
-            if symbol:
-                self._add_or_merge_symbol(symbol)
+    def _handle_c_function_definition(
+        self, node: Node, file_path: Path, code: bytes, is_header: bool
+    ):
+        symbol = self._add_symbol(
+            self._extract_c_function(node, file_path, code, is_definition=True)
+        )
+        if symbol:
+            # Extract call dependencies for function bodies
+            self.call_graph[symbol.name] = self._find_c_function_calls(node, code)
+
+    def _handle_c_declaration(self, node: Node, file_path: Path, code: bytes, is_header: bool):
+        # Check if it's a function declaration
+        if any(child.type == "function_declarator" for child in node.children):
+            self._add_symbol(self._extract_c_function(node, file_path, code, is_definition=False))
+
+        # typedef struct/enum that the parser recovered as a plain declaration
+        elif self._is_typedef_struct(node):
+            self._add_symbol(self._extract_c_typedef_struct(node, file_path, code))
+
+    def _handle_c_struct(self, node: Node, file_path: Path, code: bytes, is_header: bool):
+        self._add_symbol(
+            self._extract_c_struct(node, file_path, code, is_definition=not is_header)
+        )
 
-        elif node.type == "type_item":
-            symbol = self._extract_simple_rust_symbol(
-                node, file_path, code, "type", "type_identifier"
-            )
-            if symbol:
-                self._add_or_merge_symbol(symbol)
+    def _handle_c_enum(self, node: Node, file_path: Path, code: bytes, is_header: bool):
+        self._add_symbol(
+            self._extract_c_enum(node, file_path, code, is_definition=not is_header)
+        )
 
-        elif node.type == "impl_item":
-            symbol = self._extract_rust_impl(node, file_path, code)
-            if symbol:
-                self._add_or_merge_symbol(symbol)
+    def _handle_c_typedef(self, node: Node, file_path: Path, code: bytes, is_header: bool):
+        self._add_symbol(self._extract_c_typedef(node, file_path, code))
 
-        elif node.type == "function_signature_item":
-            symbol = self._extract_rust_ffi_function(node, file_path, code)
-            if symbol:
-                self._add_or_merge_symbol(symbol)
+    def _handle_c_define(self, node: Node, file_path: Path, code: bytes, is_header: bool):
+        if is_header:
+            self._add_symbol(self._extract_c_define(node, file_path, code))
 
-        # Recurse to children
-        for child in node.children:
-            self._traverse_rust_node(child, file_path, code)
+    def _handle_c_function_like_macro(
+        self, node: Node, file_path: Path, code: bytes, is_header: bool
+    ):
+        if not is_header:
+            return
+        symbol = self._add_symbol(self._extract_c_function_like_macro(node, file_path, code))
+        if symbol:
+            # Extract call dependencies for function-like macros
+            self.call_graph[symbol.name] = self._find_c_function_calls(node, code)
+
+    def _handle_c_init_declarator(self, node: Node, file_path: Path, code: bytes, is_header: bool):
+        if self._is_top_level_constant(node):
+            self._add_symbol(self._extract_c_constant(node, file_path, code))
+
+    # Node type -> handler; each node is dispatched with a single dict lookup.
+    _C_NODE_HANDLERS = {
+        "function_definition": _handle_c_function_definition,
+        "declaration": _handle_c_declaration,
+        "struct_specifier": _handle_c_struct,
+        "enum_specifier": _handle_c_enum,
+        "type_definition": _handle_c_typedef,
+        "preproc_def": _handle_c_define,
+        "preproc_function_def": _handle_c_function_like_macro,
+        "init_declarator": _handle_c_init_declarator,
+    }
+
+    def _extract_c_symbols(self, root: Node, file_path: Path, code: bytes, is_header: bool):
+        """Extract symbols from every C node that has a handler, in document order."""
+        for node, _ in self._c_symbol_query.captures(root):
+            self._C_NODE_HANDLERS[node.type](self, node, file_path, code, is_header)
 
     def _extract_c_function(
         self, node: Node, file_path: Path, code: bytes, is_definition: bool
@@ -969,7 +1061,7 @@ class SourceMap:
         line_num = name_node.start_point[0] + 1
 
         # Extract type dependencies from parameters and return type
-        type_deps = extract_generic_type_dependencies(node, self.built_in_types)
+        type_deps = extract_generic_type_dependencies(node, self.built_in_types, self._c_type_query)
 
         # Calculate line count for definitions
         line_count = 0
@@ -993,7 +1085,9 @@ class SourceMap:
             ast_node=node,
         )
 
-    def _extract_c_struct(self, node: Node, file_path: Path, code: bytes) -> Symbol | None:
+    def _extract_c_struct(
+        self, node: Node, file_path: Path, code: bytes, is_definition: bool | None = None
+    ) -> Symbol | None:
         """Extract C struct symbol."""
         # Skip forward declarations (structs without field_declaration_list)
         has_body = any(child.type == "field_declaration_list" for child in node.children)
@@ -1001,7 +1095,7 @@ class SourceMap:
             return None
 
         info = extract_simple_c_symbol_info(
-            node, code, "struct", file_path, self.project_root, self.built_in_types
+            node, code, "struct", file_path, self.project_root, self.built_in_types, is_definition
         )
         if not info:
             return None
@@ -1019,10 +1113,12 @@ class SourceMap:
             ast_node=node,
         )
 
-    def _extract_c_enum(self, node: Node, file_path: Path, code: bytes) -> Symbol | None:
+    def _extract_c_enum(
+        self, node: Node, file_path: Path, code: bytes, is_definition: bool | None = None
+    ) -> Symbol | None:
         """Extract C enum symbol."""
         info = extract_simple_c_symbol_info(
-            node, code, "enum", file_path, self.project_root, self.built_in_types
+            node, code, "enum", file_path, self.project_root, self.built_in_types, is_definition
         )
         if not info:
             return None
@@ -1049,21 +1145,13 @@ class SourceMap:
             or (
                 "struct" not in node_text
                 and "enum" not in node_text
-                and any(prim in node_text for prim in ["int", "char", "float", "double", "void"])
+                and _PRIMITIVE_TYPE_RE.search(node_text)
             )
         ):  # primitive aliases
             return None
 
         # For typedef struct patterns, find all type_identifiers and take the last one
-        type_identifiers = []
-
-        def find_type_identifiers(n: Node):
-            if n.type == "type_identifier":
-                type_identifiers.append(n)
-            for child in n.children:
-                find_type_identifiers(child)
-
-        find_type_identifiers(node)
+        type_identifiers = [n for n, _ in self._c_type_query.captures(node)]
 
         if not type_identifiers:
             return None
@@ -1075,14 +1163,15 @@ class SourceMap:
         line_num = name_node.start_point[0] + 1
 
         # Extract type dependencies from the typedef, excluding the typedef name itself
-        type_deps = extract_typedef_type_dependencies(node, self.built_in_types)
+        type_deps = extract_typedef_type_dependencies(node, self.built_in_types, self._c_type_query)
         type_deps.discard(name)  # Don't depend on yourself
 
-        # Determine the kind based on the typedef content
-        node_text = _node_text(node)
-        if "struct" in node_text:
+        # Determine the kind from the aliased type
+        type_node = node.child_by_field_name("type")
+        type_kind = type_node.type if type_node is not None else None
+        if type_kind == "struct_specifier":
             kind = "struct"
-        elif "enum" in node_text:
+        elif type_kind == "enum_specifier":
             kind = "enum"
         else:
             kind = "typedef"
@@ -1111,7 +1200,9 @@ class SourceMap:
         line_count = node.end_point[0] - node.start_point[0] + 1
 
         # Extract type dependencies
-        type_deps = extract_generic_type_dependencies(node, self.built_in_types)
+        type_deps = extract_generic_type_dependencies(
+            node, self.built_in_types, self._rust_type_query
+        )
 
         return self._create_symbol(
             name=name,
@@ -1212,7 +1303,7 @@ class SourceMap:
             return None
 
         type_name = _node_text(type_node)
-        name = f"impl_{type_name}"
+        name = sys.intern(f"impl_{type_name}")
         signature = extract_signature(code, node)
         line_num = type_node.start_point[0] + 1
 
@@ -1248,6 +1339,37 @@ class SourceMap:
             ast_node=node,
         )
 
+    def _extract_rust_const(self, node: Node, file_path: Path, code: bytes) -> Symbol | None:
+        return self._extract_simple_rust_symbol(node, file_path, code, "const")
+
+    def _extract_rust_static(self, node: Node, file_path: Path, code: bytes) -> Symbol | None:
+        return self._extract_simple_rust_symbol(node, file_path, code, "static")
+
+    def _extract_rust_type_alias(self, node: Node, file_path: Path, code: bytes) -> Symbol | None:
+        return self._extract_simple_rust_symbol(node, file_path, code, "type", "type_identifier")
+
+    # Node type -> extractor; each node is dispatched with a single dict lookup.
+    _RUST_NODE_EXTRACTORS = {
+        "function_item": _extract_rust_function,
+        "struct_item": _extract_rust_struct,
+        "enum_item": _extract_rust_enum,
+        "const_item": _extract_rust_const,
+        "static_item": _extract_rust_static,
+        "type_item": _extract_rust_type_alias,
+        "impl_item": _extract_rust_impl,
+        "function_signature_item": _extract_rust_ffi_function,
+    }
+
+    def _extract_rust_symbols(self, root: Node, file_path: Path, code: bytes):
+        """Extract symbols from every Rust node that has an extractor, in document order."""
+        for node, _ in self._rust_symbol_query.captures(root):
+            symbol = self._RUST_NODE_EXTRACTORS[node.type](self, node, file_path, code)
+            if symbol:
+                self._add_or_merge_symbol(symbol)
+                if node.type == "function_item":
+                    # Extract call dependencies
+                    self.call_graph[symbol.name] = self._find_rust_function_calls(node, code)
+
     def _extract_c_define(self, node: Node, file_path: Path, code: bytes) -> Symbol | None:
         """Extract C #define symbol."""
         # For #define, the name is typically the second child (after "define")
@@ -1271,7 +1393,7 @@ class SourceMap:
 
         # Check if this is a function-like macro (has parameters)
         # Look for parameter list after the macro name
-        is_function_like = self._is_function_like_macro(node, name_node)
+        is_function_like = self._is_function_like_macro(name_node, code)
 
         # Treat function-like macros as functions for dependency purposes
         kind = "function" if is_function_like else "define"
@@ -1343,21 +1465,6 @@ class SourceMap:
             ast_node=node,
         )
 
-    def _extract_c_constant_declaration(
-        self, node: Node, file_path: Path, code: bytes
-    ) -> Symbol | None:
-        """Extract C constant from a const declaration."""
-        # Find all init_declarators in this declaration
-        symbols = []
-        for child in node.children:
-            if child.type == "init_declarator":
-                symbol = self._extract_c_constant(child, file_path, code)
-                if symbol:
-                    symbols.append(symbol)
-
-        # Return the first symbol found, or None if none
-        return symbols[0] if symbols else None
-
     def _is_top_level_constant(self, node: Node) -> bool:
         """Check if this init_declarator is a top-level constant."""
         # Walk up the AST to check if this is at file scope and has const qualifier
@@ -1377,72 +1484,40 @@ class SourceMap:
 
         return False
 
-    def _is_constant_declaration(self, node: Node) -> bool:
-        """Check if this declaration is a constant declaration."""
-        # Check if the declaration contains const qualifier
-        node_text = _node_text(node)
-        return (
-            "const" in node_text
-            and "=" in node_text
-            and not any(child.type == "function_declarator" for child in node.children)
-        )
-
     def _is_header_guard_or_common_define(self, name: str, file_path: Path, node: Node) -> bool:
         """Check if this #define is a header guard or other common pattern to ignore."""
-        # Header guard patterns
-        if name.startswith("__") and name.endswith("__"):
-            return True
-
-        # Common pattern: file-based header guards
-        if name.endswith(("_H", "_H_", "_H__", "_HPP", "_HPP_", "_HPP__")):
-            return True
-
-        # Check if this is an empty define (flag macro)
-        if is_empty_define(node):
+        # Name-only checks first, cheapest first; is_empty_define has to decode the node
+        # Pattern: single letter or very short defines (often used for feature flags)
+        if len(name) <= 2:
             return True
 
         # For non-empty defines, only filter common ignore patterns (not version/feature flags)
         if name in COMMON_IGNORE_PATTERNS:
             return True
 
-        # Only filter feature flag patterns if they are empty defines
-        # (This logic is already handled above by is_empty_define check)
-
-        # Pattern: single letter or very short defines (often used for feature flags)
-        if len(name) <= 2:
+        # Header guard patterns: __NAME__ and file-based guards (NAME_H, NAME_HPP_, ...)
+        if _HEADER_GUARD_RE.fullmatch(name):
             return True
 
-        return False
+        # Check if this is an empty define (flag macro)
+        return is_empty_define(node)
 
-    def _is_function_like_macro(self, node: Node, name_node: Node) -> bool:
+    def _is_function_like_macro(self, name_node: Node, code: bytes) -> bool:
         """Check if this #define is a function-like macro (has parameters)."""
-        # Check the next character after the name
-        # If it's '(' without whitespace, it's a function-like macro
-        try:
-            # Get the full text of the preproc_def node
-            node_text = _node_text(node)
-            name_text = _node_text(name_node)
-
-            # Find the name in the node text
-            name_start = node_text.find(name_text)
-            if name_start >= 0:
-                name_end = name_start + len(name_text)
-                # Check if the character immediately after the name is '('
-                if name_end < len(node_text) and node_text[name_end] == "(":
-                    return True
-        except Exception:
-            pass
-
-        return False
+        # If the byte right after the name is '(' (no whitespace), it's a function-like macro
+        return code[name_node.end_byte : name_node.end_byte + 1] == b"("
 
     def _is_typedef_struct(self, node: Node) -> bool:
         """Check if this declaration is a typedef struct."""
-        node_text = _node_text(node)
-        return (
-            "typedef" in node_text
-            and ("struct" in node_text or "enum" in node_text)
-            and node_text.strip().endswith(";")
-        )
+        type_node = node.child_by_field_name("type")
+        if type_node is None or type_node.type not in ("struct_specifier", "enum_specifier"):
+            return False
+        if node.children[-1].type != ";" or node.children[-1].is_missing:
+            return False
+        # The parser only recovers this shape when "typedef" precedes the type; check just
+        # that prefix rather than scanning the whole struct body
+        assert node.text is not None
+        return b"typedef" in node.text[: type_node.start_byte - node.start_byte]
 
     def _extract_c_typedef_struct(self, node: Node, file_path: Path, code: bytes) -> Symbol | None:
         """Extract C typedef struct/enum symbol."""
@@ -1451,15 +1526,7 @@ class SourceMap:
             return None
 
         # Look for the typedef name (usually the last identifier before semicolon)
-        identifiers = []
-
-        def find_identifiers(n: Node):
-            if n.type == "type_identifier":
-                identifiers.append(_node_text(n))
-            for child in n.children:
-                find_identifiers(child)
-
-        find_identifiers(node)
+        identifiers = [_node_text(n) for n, _ in self._c_type_query.captures(node)]
 
         if not identifiers:
             return None
@@ -1470,7 +1537,7 @@ class SourceMap:
         line_num = node.start_point[0] + 1
 
         # Extract type dependencies from the struct/enum body
-        type_deps = extract_generic_type_dependencies(node, self.built_in_types)
+        type_deps = extract_generic_type_dependencies(node, self.built_in_types, self._c_type_query)
 
         return self._create_symbol(
             name=name,
@@ -1484,6 +1551,14 @@ class SourceMap:
             ast_node=node,
         )
 
+    def _relpath(self, file_path: Path) -> Path:
+        """Return file_path relative to the project root, memoized per file."""
+        relative_path = self._relpath_cache.get(file_path)
+        if relative_path is None:
+            relative_path = file_path.relative_to(self.project_root)
+            self._relpath_cache[file_path] = relative_path
+        return relative_path
+
     def _create_symbol(
         self,
         name: str,
@@ -1499,97 +1574,110 @@ class SourceMap:
         ast_node: Node | None = None,
     ) -> Symbol:
         """Helper method to create symbols with relative paths."""
-        relative_path = file_path.relative_to(self.project_root)
+        relative_path = self._relpath(file_path)
+        type_dependencies = type_deps or _NO_DEPENDENCIES
 
-        symbol = Symbol(
-            name=name,
-            kind=kind,
-            language=language,
-            signature=signature,
-            type_dependencies=type_deps or set(),
-            line_count=line_count,
+        # Build the symbol in one constructor call with its location filled in
+        if is_definition:
+            return Symbol(
+                name,
+                kind,
+                language,
+                signature,
+                definition_file=relative_path,
+                definition_line=line_num,
+                type_dependencies=type_dependencies,
+                is_static=is_static,
+                line_count=line_count,
+                _definition_node=ast_node,
+            )
+        return Symbol(
+            name,
+            kind,
+            language,
+            signature,
+            declaration_file=relative_path,
+            declaration_line=line_num,
+            type_dependencies=type_dependencies,
             is_static=is_static,
+            line_count=line_count,
+            _declaration_node=ast_node,
         )
 
-        if is_definition:
-            symbol.definition_file = relative_path
-            symbol.definition_line = line_num
-            symbol._definition_node = ast_node
-        else:
-            symbol.declaration_file = relative_path
-            symbol.declaration_line = line_num
-            symbol._declaration_node = ast_node
-
-        return symbol
-
     def _add_or_merge_symbol(self, symbol: Symbol):
         """Add symbol or merge with existing one."""
+        self._symbols_version += 1
         key = (symbol.name, symbol.language)
         existing = self.symbols.get(key)
         if existing is None:
             self.symbols[key] = symbol
-            # Also add to by-name index
+            # Also add to by-name and by-kind indexes
             if symbol.name not in self.symbols_by_name:
                 self.symbols_by_name[symbol.name] = []
             self.symbols_by_name[symbol.name].append(symbol)
+            self.symbols_by_kind[(symbol.name, symbol.kind, symbol.language)] = symbol
+            self.symbols_by_language[symbol.language][symbol.name] = symbol
         else:
+            old_kind = existing.kind
             existing.merge_with(symbol)
+            if existing.kind != old_kind:
+                del self.symbols_by_kind[(existing.name, old_kind, existing.language)]
+                self.symbols_by_kind[(existing.name, existing.kind, existing.language)] = existing
 
     def _unify_struct_typedefs(self):
         """Unify struct definitions with their typedef counterparts."""
-        symbols_to_remove = []
+        self._symbols_version += 1
+        symbols_to_remove: set[tuple[str, str]] = set()
         unified_symbols = []
         processed_pairs = set()
 
-        # Find typedef symbols that could be unified with structs
-        for (_, language), symbol in self.symbols.items():
-            if language == "c" and symbol.kind in ["struct", "typedef"]:
-                unification_candidate = find_unification_candidate(symbol, self.symbols_by_name)
-
-                if unification_candidate:
-                    # Avoid processing the same pair twice
-                    pair_key = tuple(sorted([symbol.name, unification_candidate.name]))
-                    if pair_key in processed_pairs:
-                        continue
-                    processed_pairs.add(pair_key)
-
-                    # Create unified symbol - prefer typedef name
-                    # Determine which one is the typedef and which is the struct with body
-                    if has_struct_body(symbol):
-                        struct_symbol = symbol
-                        typedef_symbol = unification_candidate
-                    else:
-                        struct_symbol = unification_candidate
-                        typedef_symbol = symbol
-
-                    unified = unify_struct_typedef(struct_symbol, typedef_symbol)
-
-                    unified_symbols.append(unified)
-
-                    # Mark originals for removal
-                    symbols_to_remove.append((symbol.name, language))
-                    symbols_to_remove.append((unification_candidate.name, language))
-
-        # Also remove any remaining forward declarations that didn't get unified
-        for (symbol_name, language), symbol in list(self.symbols.items()):
-            if (
-                language == "c"
-                and symbol.kind in ["struct", "typedef"]
-                and (symbol_name, language) not in symbols_to_remove
-            ):
-                # Check if this is a forward declaration or simple typedef
-                node = symbol._definition_node or symbol._declaration_node
-                if node and is_simple_typedef(node):
-                    symbols_to_remove.append((symbol_name, language))
-                # Also remove struct symbols that don't have bodies
-                elif symbol.kind == "struct" and not has_struct_body(symbol):
-                    symbols_to_remove.append((symbol_name, language))
+        # One pass: unify struct/typedef pairs and collect leftover forward declarations
+        language = "c"
+        for symbol_name, symbol in self.symbols_by_language[language].items():
+            if symbol.kind not in ("struct", "typedef"):
+                continue
+
+            unification_candidate = find_unification_candidate(symbol, self.symbols_by_kind)
+            if unification_candidate:
+                # Both halves of a pair are removed, so each pair is unified once
+                pair_key = tuple(sorted([symbol.name, unification_candidate.name]))
+                if pair_key in processed_pairs:
+                    continue
+                processed_pairs.add(pair_key)
+
+                # Create unified symbol - prefer typedef name
+                # Determine which one is the typedef and which is the struct with body
+                if has_struct_body(symbol):
+                    struct_symbol = symbol
+                    typedef_symbol = unification_candidate
+                else:
+                    struct_symbol = unification_candidate
+                    typedef_symbol = symbol
+
+                unified = unify_struct_typedef(struct_symbol, typedef_symbol)
+
+                unified_symbols.append(unified)
+
+                # Mark originals for removal
+                symbols_to_remove.add((symbol.name, language))
+                symbols_to_remove.add((unification_candidate.name, language))
+                continue
+
+            # Remove forward declarations and simple typedefs that didn't get unified
+            node = symbol._definition_node or symbol._declaration_node
+            if node and is_simple_typedef(node):
+                symbols_to_remove.add((symbol_name, language))
+            # Also remove struct symbols that don't have bodies
+            elif symbol.kind == "struct" and not has_struct_body(symbol):
+                symbols_to_remove.add((symbol_name, language))
 
         # Remove original symbols
         for key in symbols_to_remove:
             if key in self.symbols:
                 old_symbol = self.symbols[key]
                 del self.symbols[key]
+                del self.symbols_by_kind[(old_symbol.name, old_symbol.kind, old_symbol.language)]
+                del self.symbols_by_language[old_symbol.language][old_symbol.name]
 
                 # Remove from by-name index
                 if old_symbol.name in self.symbols_by_name:
@@ -1606,47 +1694,12 @@ class SourceMap:
     def _find_c_function_calls(self, node: Node, code: bytes) -> set[str]:
         """Find all function calls within a C function."""
         del code  # Unused parameter
-        calls = set()
-
-        def find_calls(n: Node):
-            if should_skip(_node_text(n), self.built_in_types):
-                return
-
-            if n.type == "call_expression":
-                # Get the function name from the call
-                for child in n.children:
-                    if child.type == "identifier":
-                        calls.add(_node_text(child))
-                        break
-            for child in n.children:
-                find_calls(child)
-
-        find_calls(node)
-        return calls
+        return {_node_text(callee) for callee, _ in self._c_call_query.captures(node)}
 
     def _find_rust_function_calls(self, node: Node, code: bytes) -> set[str]:
         """Find all function calls within a Rust function."""
         del code  # Unused parameter
-        calls = set()
-
-        def find_calls(n: Node):
-            if n.type == "call_expression":
-                # Get the function name from the call
-                for child in n.children:
-                    if child.type == "identifier":
-                        calls.add(_node_text(child))
-                        break
-                    elif child.type == "field_expression":
-                        # Handle method calls
-                        for grandchild in child.children:
-                            if grandchild.type == "field_identifier":
-                                calls.add(_node_text(grandchild))
-                                break
-            for child in n.children:
-                find_calls(child)
-
-        find_calls(node)
-        return calls
+        return {_node_text(callee) for callee, _ in self._rust_call_query.captures(node)}
 
     def _resolve_transitive_dependencies(self):
         """Resolve transitive dependencies by combining type deps and call graph."""
@@ -1681,18 +1734,19 @@ class SourceMap:
                         if sub_dep not in visited:
                             to_visit.append(sub_dep)
 
-            # Update transitive dependencies
-            symbol.transitive_dependencies = (
-                all_deps - symbol.type_dependencies - symbol.call_dependencies
-            )
+            # Update transitive dependencies (the repo map counts them)
+            transitive = all_deps - symbol.type_dependencies - symbol.call_dependencies
+            if transitive != symbol.transitive_dependencies:
+                symbol.transitive_dependencies = transitive
+                self._symbols_version += 1
+
+    def _preferred_symbol(self, name: str) -> Symbol | None:
+        """Return the Rust symbol with this name, else the C one."""
+        return self.symbols.get((name, "rust")) or self.symbols.get((name, "c"))
 
     def _get_symbol_dependencies(self, node_name: str) -> set[str]:
         """Get dependencies for a node (try rust first then c)."""
-        node_symbol = None
-        for (name, language), s in self.symbols.items():
-            if name == node_name:
-                if node_symbol is None or language == "rust":
-                    node_symbol = s
+        node_symbol = self._preferred_symbol(node_name)
 
         if not node_symbol:
             return set()
@@ -1760,14 +1814,9 @@ class SourceMap:
         c_symbols = {}
         c_symbols_by_name = {}
 
-        for (symbol_name, language), symbol in self.symbols.items():
-            if (
-                language == "c"
-                and symbol.kind
-                in ["function", "struct", "enum", "const", "define", "typedef"]
-                and self._should_keep_symbol(symbol)
-            ):
-                c_symbols[(symbol_name, language)] = symbol
+        for symbol_name, symbol in self.symbols_by_language["c"].items():
+            if symbol.kind in _TOPO_SORT_KINDS and self._should_keep_symbol(symbol):
+                c_symbols[(symbol_name, "c")] = symbol
                 if symbol_name not in c_symbols_by_name:
                     c_symbols_by_name[symbol_name] = []
                 c_symbols_by_name[symbol_name].append(symbol)
@@ -1777,32 +1826,32 @@ class SourceMap:
             c_symbols, c_symbols_by_name
         )
 
-        # Mark symbols in cycles
+        # Mark symbols in cycles (the repo map shows the flag, so a change invalidates it)
         for scc in sccs:
             if len(scc) > 1:
                 for symbol_name in scc:
                     if symbol_name in c_symbols_by_name:
                         for s in c_symbols_by_name[symbol_name]:
-                            s.is_cycle = True
+                            if not s.is_cycle:
+                                s.is_cycle = True
+                                self._symbols_version += 1
 
         # Build adjacency list and in-degree count - only for C symbols
         adj_list = defaultdict(list)
-        in_degree = defaultdict(int)
-
-        # Initialize all C symbols with in-degree 0
-        for symbol_name in c_symbols_by_name:
-            in_degree[symbol_name] = 0
+        # Every C symbol starts with in-degree 0
+        in_degree = dict.fromkeys(c_symbols_by_name, 0)
 
         # Build graph - only consider dependencies between C symbols
+        c_names = c_symbols_by_name.keys()
         for (symbol_name, _), symbol in c_symbols.items():
-            for dep in symbol.all_dependencies:
-                if dep in c_symbols_by_name and dep != symbol_name:
+            for dep in symbol.all_dependencies & c_names:
+                if dep != symbol_name:
                     adj_list[dep].append(symbol_name)
                     in_degree[symbol_name] += 1
 
         # Kahn's algorithm with depth tracking
         queue: deque[tuple[str, int]] = deque()  # (symbol_name, depth)
-        result: list[tuple[Symbol, int]] = []  # (symbol, depth)
+        ordered: list[Symbol] = []  # depths are stored on the symbols as they are placed
         symbol_depths: dict[str, int] = {}
 
         # Start with nodes that have no dependencies at depth 0
@@ -1814,53 +1863,40 @@ class SourceMap:
         while queue:
             current, depth = queue.popleft()
             # Get the C symbol
-            current_symbol = None
-            for (name, _), s in c_symbols.items():
-                if name == current:
-                    current_symbol = s
-                    break
-            if current_symbol:
-                result.append((current_symbol, depth))
+            current_symbol = c_symbols_by_name[current][0]
+            current_symbol._depth = depth
+            ordered.append(current_symbol)
 
             # Remove edges from current node and update depths
             for neighbor in adj_list[current]:
                 in_degree[neighbor] -= 1
                 # Update neighbor's depth to be at least current depth + 1
-                neighbor_depth = max(symbol_depths.get(neighbor, 0), depth + 1)
-                symbol_depths[neighbor] = neighbor_depth
+                neighbor_depth = symbol_depths.get(neighbor, 0)
+                if neighbor_depth <= depth:
+                    neighbor_depth = symbol_depths[neighbor] = depth + 1
 
                 if in_degree[neighbor] == 0:
                     queue.append((neighbor, neighbor_depth))
 
         # Handle remaining nodes (those in cycles) - assign them max depth + 1
-        remaining = set(key[0] for key in c_symbols.keys()) - {s.name for s, _ in result}
+        remaining = c_symbols_by_name.keys() - {s.name for s in ordered}
         if remaining:
-            max_depth = max((depth for _, depth in result), default=0)
+            max_depth = max((s._depth for s in ordered), default=0)
             cycle_depth = max_depth + 1
             # Add remaining symbols sorted by name
             for symbol_name in sorted(remaining):
                 # Get the first symbol with this name
-                for (name, _), symbol in c_symbols.items():
-                    if name == symbol_name:
-                        result.append((symbol, cycle_depth))
-                        symbol_depths[symbol_name] = cycle_depth
-                        break
-
-        # Store depths in symbols for later use
-        for symbol, depth in result:
-            symbol._depth = depth
+                symbol = c_symbols_by_name[symbol_name][0]
+                symbol._depth = cycle_depth
+                ordered.append(symbol)
+                symbol_depths[symbol_name] = cycle_depth
 
-        # Return just the symbols (depths are stored in the symbols themselves)
-        return [symbol for symbol, _ in result]
+        return ordered
 
     def get_symbol_source_code(self, symbol_name: str) -> str:
         """Get the source code for a symbol."""
-        # Get the first symbol with this name (prefer rust over c)
-        symbol: Symbol | None = None
-        for (name, language), s in self.symbols.items():
-            if name == symbol_name:
-                if symbol is None or language == "rust":
-                    symbol = s
+        # Get the symbol with this name (prefer rust over c)
+        symbol = self._preferred_symbol(symbol_name)
         if not symbol:
             return ""
 
@@ -1881,11 +1917,18 @@ class SourceMap:
 
     def _get_c_symbol_source_code(self, symbol: Symbol, file_path: Path) -> str:
         """Get C symbol source code using tree-sitter."""
-        return get_c_symbol_source_code(symbol, file_path)
+        node = symbol._definition_node or symbol._declaration_node
+        if not node:
+            return ""
+
+        try:
+            return get_node_context(self._source_bytes(file_path), node)
+        except Exception:
+            return ""
 
     def _get_rust_symbol_source_code(self, symbol: Symbol, file_path: Path) -> str:
         """Get Rust symbol source code using tree-sitter."""
-        return get_c_symbol_source_code(symbol, file_path)  # Same implementation works for both
+        return self._get_c_symbol_source_code(symbol, file_path)  # Same implementation
 
     def lookup_symbol(self, symbol_name: str) -> SymbolInfo:
         """Find all locations of a symbol and return SymbolInfo with all paths."""
@@ -1897,33 +1940,29 @@ class SourceMap:
         if matching_symbols:
             # Process all matching symbols
             for symbol in matching_symbols:
+                # Stringify each location once; a missing location never matches a suffix
+                declaration = str(symbol.declaration_file) if symbol.declaration_file else ""
+                definition = str(symbol.definition_file) if symbol.definition_file else ""
+
                 # Check for FFI binding (if this is the declaration in ffi.rs)
-                if symbol.declaration_file and str(symbol.declaration_file).endswith("ffi.rs"):
-                    info.ffi_path = str(symbol.declaration_file)
+                if declaration.endswith("ffi.rs"):
+                    info.ffi_path = declaration
 
                 # Check for Rust implementation
-                if (
-                    symbol.definition_file
-                    and str(symbol.definition_file).endswith(".rs")
-                    and "ffi.rs" not in str(symbol.definition_file)
-                ):
-                    info.rust_src_path = str(symbol.definition_file)
-                elif (
-                    symbol.declaration_file
-                    and str(symbol.declaration_file).endswith(".rs")
-                    and "ffi.rs" not in str(symbol.declaration_file)
-                ):
-                    info.rust_src_path = str(symbol.declaration_file)
+                if definition.endswith(".rs") and "ffi.rs" not in definition:
+                    info.rust_src_path = definition
+                elif declaration.endswith(".rs") and "ffi.rs" not in declaration:
+                    info.rust_src_path = declaration
 
                 # Check for C header (could be declaration or definition in .h file)
-                if symbol.declaration_file and str(symbol.declaration_file).endswith(".h"):
-                    info.c_header_path = str(symbol.declaration_file)
-                elif symbol.definition_file and str(symbol.definition_file).endswith(".h"):
-                    info.c_header_path = str(symbol.definition_file)
+                if declaration.endswith(".h"):
+                    info.c_header_path = declaration
+                elif definition.endswith(".h"):
+                    info.c_header_path = definition
 
                 # Check for C source
-                if symbol.definition_file and str(symbol.definition_file).endswith(".c"):
-                    info.c_source_path = str(symbol.definition_file)
+                if definition.endswith(".c"):
+                    info.c_source_path = definition
 
         # Check for FFI binding manually if not found in symbols
         if not info.ffi_path:
@@ -1950,19 +1989,15 @@ class SourceMap:
         deps = symbol.all_dependencies
 
         # Filter to only include dependencies that exist in our symbol map
-        valid_deps = {dep for dep in deps if dep in self.symbols_by_name}
+        valid_deps = deps & self.symbols_by_name.keys()
 
-        # Create subgraph for dependencies
-        subgraph_symbols = {}
-        for name in valid_deps:
-            # Get the first symbol with this name
-            for s in self.symbols_by_name[name]:
-                subgraph_symbols[name] = s
-                break
+        # Zero or one dependency is already in order
+        if len(valid_deps) <= 1:
+            return list(valid_deps)
 
-        # Perform topological sort on subgraph
-        if not subgraph_symbols:
-            return []
+        # Create subgraph for dependencies
+        # Use the first symbol with each name
+        subgraph_symbols = {name: self.symbols_by_name[name][0] for name in valid_deps}
 
         # Build adjacency list for dependencies only
         adj_list = defaultdict(list)
@@ -2003,13 +2038,17 @@ class SourceMap:
 
     def generate_repomap(self) -> str:
         """Generate Aider-style repository map summary."""
-        lines = []
-        lines.append("# Repository Map")
-        lines.append("")
+        # The map only changes when the symbols do
+        if self._repomap_cache is not None and self._repomap_cache[0] == self._symbols_version:
+            return self._repomap_cache[1]
+
+        buf = StringIO()
+        write = buf.write
+        write("# Repository Map\n\n")
 
         # Group symbols by file
         files_map = defaultdict(list)
-        for symbol in [s for symbols_list in self.symbols_by_name.values() for s in symbols_list]:
+        for symbol in (s for symbols_list in self.symbols_by_name.values() for s in symbols_list):
             file_path = symbol.definition_file or symbol.declaration_file
             if file_path:
                 # file_path is already relative to project_root
@@ -2017,19 +2056,12 @@ class SourceMap:
 
         # Sort files by path
         for file_path in sorted(files_map.keys()):
-            symbols = files_map[file_path]
-            lines.append(f"## {file_path}")
-            lines.append("")
-
-            # Group by symbol type
-            by_kind = defaultdict(list)
-            for symbol in symbols:
-                by_kind[symbol.kind].append(symbol)
+            write(f"## {file_path}\n\n")
 
-            # Show each kind
-            for kind in sorted(by_kind.keys()):
-                kind_symbols = sorted(by_kind[kind], key=lambda s: s.name)
-                lines.append(f"### {kind.title()}s")
+            # Show each kind, symbols sorted by name within it
+            symbols = sorted(files_map[file_path], key=lambda s: (s.kind, s.name))
+            for kind, kind_symbols in groupby(symbols, key=lambda s: s.kind):
+                write(f"### {kind.title()}s\n")
 
                 for symbol in kind_symbols:
                     line_info = ""
@@ -2039,26 +2071,25 @@ class SourceMap:
                         line_info = f":{symbol.declaration_line}"
 
                     deps_info = ""
-                    if symbol.all_dependencies:
-                        dep_count = len(symbol.all_dependencies)
+                    dep_count = len(symbol.all_dependencies)
+                    if dep_count:
                         deps_info = f" ({dep_count} deps)"
 
                     cycle_info = " [CYCLE]" if symbol.is_cycle else ""
                     static_info = " [STATIC]" if symbol.is_static else ""
 
-                    lines.append(
-                        f"- **{symbol.name}**{line_info}{deps_info}{cycle_info}{static_info}"
-                    )
+                    write(f"- **{symbol.name}**{line_info}{deps_info}{cycle_info}{static_info}\n")
 
                     # Show signature for smaller items
                     if len(symbol.signature) < 100:
-                        lines.append(f"  ```{symbol.language}")
-                        lines.append(f"  {symbol.signature}")
-                        lines.append("  ```")
+                        write(f"  ```{symbol.language}\n  {symbol.signature}\n  ```\n")
 
-                lines.append("")
+                write("\n")
 
-        return "\n".join(lines)
+        # Lines are newline-joined, so drop the terminator of the last one
+        repomap = buf.getvalue()[:-1]
+        self._repomap_cache = (self._symbols_version, repomap)
+        return repomap
 
     def get_topological_order(self) -> list[Symbol]:
         return self.parse_project()
@@ -2090,11 +2121,7 @@ class SourceMap:
         # Return the first symbol with this name (could be C or Rust)
         # In most cases there will only be one, but if there are multiple
         # (e.g., C and Rust versions), prefer the C version for compatibility
-        symbols = self.symbols_by_name[symbol_name]
-        c_symbols = [s for s in symbols if s.language == "c"]
-        if c_symbols:
-            return c_symbols[0]
-        return symbols[0]
+        return self.symbols.get((symbol_name, "c")) or self.symbols_by_name[symbol_name][0]
 
     def find_c_symbol_definition(self, file_path: Path, symbol_name: str) -> str:
         """Find C symbol definition using parsed symbol data."""
@@ -2121,7 +2148,7 @@ class SourceMap:
             if target_node:
                 # Extract the full source code from the AST node
                 try:
-                    code = file_path.read_bytes()
+                    code = self._source_bytes(file_path)
                     return extract_signature(code, target_node)
                 except Exception:
                     # Fall back to signature if we can't extract from file
@@ -2150,7 +2177,7 @@ class SourceMap:
                     # Try to extract full source from AST node
                     if symbol._declaration_node:
                         try:
-                            code = file_path.read_bytes()
+                            code = self._source_bytes(file_path)
                             return extract_signature(code, symbol._declaration_node)
                         except Exception:
                             pass
@@ -2171,7 +2198,7 @@ class SourceMap:
                 ):
                     # Try to extract full source from AST node
                     try:
-                        code = file_path.read_bytes()
+                        code = self._source_bytes(file_path)
                         return extract_signature(code, symbol._definition_node)
                     except Exception:
                         pass
@@ -2197,13 +2224,23 @@ class SourceMap:
 
     def is_fuzz_test_defined(self, file_path: Path, symbol_name: str) -> bool:
         """Check if a fuzz test is defined for a symbol."""
-        if not file_path.exists():
+        try:
+            st = file_path.stat()
+        except OSError:
             return False
 
-        content = file_path.read_text()
+        # Reread the file only when it changed on disk
+        stat = (st.st_mtime_ns, st.st_size)
+        cached = self._fuzz_test_cache.get(file_path)
+        if cached is None or cached[0] != stat:
+            content = file_path.read_text()
+            # Only files containing a fuzz target can define a fuzz test
+            cached = (stat, content if "fuzz_target!" in content else None)
+            self._fuzz_test_cache[file_path] = cached
 
         # Look for the symbol name in the fuzz test
-        return symbol_name in content and "fuzz_target!" in content
+        content = cached[1]
+        return content is not None and symbol_name in content
 
 
 if __name__ == "__main__":
@@ -2251,44 +2288,28 @@ if __name__ == "__main__":
         ]
     )
 
-    # Write symbol data
-    for symbol in sorted_symbols:
+    def _row(symbol: Symbol) -> tuple[str, ...]:
         # Determine file path and line number
         if symbol.definition_file:
-            file_path = str(symbol.definition_file)
-            line_number = symbol.definition_line or ""
-            is_definition = True
+            location = f"{symbol.definition_file}:{symbol.definition_line or ''}"
         elif symbol.declaration_file:
-            file_path = str(symbol.declaration_file)
-            line_number = symbol.declaration_line or ""
-            is_definition = False
+            location = f"{symbol.declaration_file}:{symbol.declaration_line or ''}"
         else:
-            file_path = ""
-            line_number = ""
-            is_definition = False
-
-        dependencies = []
-        # Only include direct dependencies, not transitive ones
-        for dep in symbol.type_dependencies | symbol.call_dependencies:
-            try:
-                dependencies.append(dep)
-            except Exception:
-                pass
-                # dependencies.append(dep)
-
-        dependencies = set(dependencies)
-
-        csv_writer.writerow(
-            [
-                symbol.name,
-                symbol.kind,
-                f"{file_path}:{line_number}",
-                "cycle" if symbol.is_cycle else "",
-                "static" if symbol.is_static else "",
-                ";".join(set(dependencies)),
-            ]
+            location = ":"
+
+        return (
+            symbol.name,
+            symbol.kind,
+            location,
+            "cycle" if symbol.is_cycle else "",
+            "static" if symbol.is_static else "",
+            # Only include direct dependencies, not transitive ones
+            ";".join(symbol.type_dependencies | symbol.call_dependencies),
         )
 
+    # Write symbol data
+    csv_writer.writerows(_row(symbol) for symbol in sorted_symbols)
+
     # Collect file statistics
     file_stats = {}
     for symbol in sorted_symbols:
@@ -2304,8 +2325,9 @@ if __name__ == "__main__":
                 try:
                     full_path = source_map.project_root / file_path
                     if full_path.exists():
-                        with open(full_path, encoding='utf-8', errors='ignore') as f:
-                            line_count = sum(1 for _ in f)
+                        # Parsed bytes are already in memory; splitlines counts lines in C
+                        # with the same \n, \r and \r\n boundaries as text-mode iteration
+                        line_count = len(source_map._source_bytes(full_path).splitlines())
                     else:
                         line_count = 0
                 except Exception:
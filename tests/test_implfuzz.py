@@ -881,5 +881,17 @@ def test_builder_context_processed_symbols():
         assert len(ctx.processed_symbols) == 2  # Still 2, no duplicates
 
 
+def test_builder_context_relative_to_root():
+    """Test BuilderContext.relative_to_root for absolute and relative paths."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        ctx = create_test_context(temp_path)
+
+        assert ctx.relative_to_root(temp_path / "rust" / "src" / "lib.rs") == Path(
+            "rust/src/lib.rs"
+        )
+        assert ctx.relative_to_root(Path("rust/src/ffi.rs")) == Path("rust/src/ffi.rs")
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
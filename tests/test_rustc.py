@@ -17,6 +17,7 @@ from portkit.rustc import (
     transpile,
     transpile_const,
     transpile_enum,
+    write_transpiled_symbol,
 )
 from portkit.sourcemap import SourceMap, Symbol
 
@@ -118,6 +119,36 @@ def test_extract_define_value_and_type():
     assert value == '"1.0"'
     assert rust_type == "&str"
 
+    # Integer suffixes are shared with number literals
+    value, rust_type = extract_define_value_and_type("#define MASK 0xFFUL")
+    assert value == "0xFF"
+    assert rust_type == "usize"
+
+    # Identifiers and expressions are left to the agent
+    with pytest.raises(RustTranscribeError):
+        extract_define_value_and_type("#define NODE_TYPE XML_TEXT_NODE")
+    with pytest.raises(RustTranscribeError):
+        extract_define_value_and_type("#define MASK (SIZE - 1)")
+
+
+def test_extract_define_integer_suffixes():
+    """Test that the whole integer suffix is stripped and mapped to a Rust type."""
+    assert extract_define_value_and_type("#define X 10LU") == ("10", "usize")
+    assert extract_define_value_and_type("#define X 10ULL") == ("10", "u64")
+    assert extract_define_value_and_type("#define X 10ll") == ("10", "i64")
+    assert extract_define_value_and_type("#define X 10u") == ("10", "u32")
+    assert extract_define_value_and_type("#define X 10L") == ("10", "isize")
+
+    # Expressions ending in a suffixed literal and long double literals are left to the agent
+    with pytest.raises(RustTranscribeError):
+        extract_define_value_and_type("#define X 1UL << 3UL")
+    with pytest.raises(RustTranscribeError):
+        extract_define_value_and_type("#define X 1 << 4u")
+    with pytest.raises(RustTranscribeError):
+        extract_define_value_and_type("#define X 0x10 | 0x20u")
+    with pytest.raises(RustTranscribeError):
+        extract_define_value_and_type("#define X 1.0L")
+
 
 def test_extract_const_declaration():
     """Test extraction of const declarations."""
@@ -131,6 +162,20 @@ def test_extract_const_declaration():
     assert rust_type == "usize"
     assert value == "4096"
 
+    name, rust_type, value = extract_const_declaration('static const char *VERSION = "1.0";')
+    assert name == "VERSION"
+    assert rust_type == "&str"
+    assert value == '"1.0"'
+
+    # Keywords inside the initializer don't affect the type
+    name, rust_type, value = extract_const_declaration('const char *KIND = "unsigned int";')
+    assert rust_type == "&str"
+
+    name, rust_type, value = extract_const_declaration("const unsigned int table[3] = {1, 2, 3};")
+    assert name == "table"
+    assert rust_type == "[u32; 3]"
+    assert value == "[1, 2, 3]"
+
 
 def test_can_transpile_directly():
     """Test which symbols can be directly transpiled."""
@@ -158,6 +203,19 @@ def test_transpile_const():
     assert result == "pub const BUFFER_SIZE: i32 = 4096;"
 
 
+def test_transpile_repeated():
+    """Transpiling the same symbol twice gives the same result."""
+    define_symbol = create_symbol_from_c_code("#define CACHED_SIZE 64", "CACHED_SIZE")
+    first = transpile_const(define_symbol)
+    assert first == "pub const CACHED_SIZE: u32 = 64;"
+    assert transpile_const(define_symbol) == first
+
+    # Pointing the symbol at a node with different source gives the new result
+    other = create_symbol_from_c_code("#define CACHED_SIZE 128", "CACHED_SIZE")
+    define_symbol._definition_node = other._definition_node
+    assert transpile_const(define_symbol) == "pub const CACHED_SIZE: u32 = 128;"
+
+
 def test_transpile_enum():
     """Test transpilation of enum symbols."""
     # Simple enum with variants
@@ -235,5 +293,31 @@ def test_real_world_examples():
     assert result == "pub const ZOPFLI_LARGE_FLOAT: f64 = 1e30;"
 
 
+def test_write_transpiled_symbol():
+    """Test appending transpiled symbols without duplicating them."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        target = Path(temp_dir) / "src" / "consts.rs"
+        size_symbol = Symbol(name="SIZE", kind="define", language="c", signature="")
+        write_transpiled_symbol(size_symbol, "pub const SIZE: u32 = 1;", target)
+        write_transpiled_symbol(size_symbol, "pub const SIZE: u32 = 1;", target)
+        assert target.read_text() == "pub const SIZE: u32 = 1;\n\n"
+
+        # A name that merely prefixes an existing one is still written
+        max_symbol = Symbol(name="MAX", kind="define", language="c", signature="")
+        target.write_text("pub const MAX_LEN: u32 = 2;")
+        write_transpiled_symbol(max_symbol, "pub const MAX: u32 = 3;", target)
+        assert target.read_text() == "pub const MAX_LEN: u32 = 2;\npub const MAX: u32 = 3;\n\n"
+
+        # External edits to the file are picked up
+        target.write_text("pub const SIZE: u32 = 1;\n")
+        write_transpiled_symbol(size_symbol, "pub const SIZE: u32 = 1;", target)
+        assert target.read_text() == "pub const SIZE: u32 = 1;\n"
+
+        # A same-size rewrite that removes the symbol is seen too
+        target.write_text("pub const SIZF: u32 = 1;\n")
+        write_transpiled_symbol(size_symbol, "pub const SIZE: u32 = 1;", target)
+        assert target.read_text() == "pub const SIZF: u32 = 1;\npub const SIZE: u32 = 1;\n\n"
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -6,7 +6,12 @@ from pathlib import Path
 import pytest
 
 from portkit.config import ProjectConfig
-from portkit.sourcemap import SourceMap
+from portkit.sourcemap import (
+    SourceMap,
+    Symbol,
+    detect_strongly_connected_components,
+    iter_source_files,
+)
 
 
 @pytest.fixture
@@ -279,6 +284,25 @@ typedef struct Node* NodePtr;
             symbol = typedef_symbols[0]
             assert "Node" in symbol.type_dependencies
 
+    def test_typedef_kind_from_aliased_type(self, temp_project):
+        """Test that typedef kind follows the aliased type, not words in its body."""
+        h_file = temp_project / "src" / "test.h"
+        h_file.write_text(
+            """
+typedef enum {
+    kind_struct,
+    kind_union
+} NodeKind;
+"""
+        )
+
+        config = ProjectConfig(
+            project_name="test", library_name="test", project_root=temp_project
+        )
+        source_map = SourceMap(temp_project, config)
+
+        assert source_map.get_symbol("NodeKind").kind == "enum"
+
 
 class TestDependencyOrdering:
     """Test dependency ordering functionality."""
@@ -349,6 +373,147 @@ int main_func(int x) {
             assert "helper" in source_map.call_graph.get("main_func", set())
 
 
+    def test_deep_call_chain_scc(self):
+        """Test that SCC detection handles chains deeper than the recursion limit."""
+        depth = 5000
+        graph = {f"f{i}": [f"f{i + 1}"] for i in range(depth)}
+        graph[f"f{depth - 1}"] = ["f0"]
+
+        sccs = detect_strongly_connected_components(graph, lambda name: graph[name])
+        assert sccs == [set(graph)]
+
+    def test_transitive_dependencies(self, temp_project):
+        """Test that transitive dependencies follow types and calls through cycles."""
+        c_file = temp_project / "src" / "test.c"
+        c_file.write_text(
+            """
+struct Leaf { int v; };
+void leaf_use(struct Leaf *leaf) { leaf->v = 0; }
+void mid(void) { leaf_use(0); }
+void top(void) { mid(); }
+
+void ping(int n);
+void pong(int n) { ping(n); }
+void ping(int n) { top(); pong(n); }
+"""
+        )
+
+        config = ProjectConfig(
+            project_name="test", library_name="test", project_root=temp_project
+        )
+        source_map = SourceMap(temp_project, config)
+        source_map._resolve_transitive_dependencies()
+
+        assert source_map.get_symbol("top").transitive_dependencies == {"mid", "leaf_use", "Leaf"}
+        assert source_map.get_symbol("pong").transitive_dependencies == {
+            "ping", "pong", "top", "mid", "leaf_use", "Leaf"
+        }
+
+
+class TestParseCache:
+    """Test the caches a SourceMap keeps for lookups after parsing."""
+
+    def test_source_lookup_uses_parsed_bytes(self, temp_project):
+        """Test that source lookups read the bytes the tree was parsed from."""
+        h_file = temp_project / "src" / "test.h"
+        h_file.write_text("struct Point { int x; int y; };\n")
+        config = ProjectConfig(
+            project_name="test", library_name="test", project_root=temp_project
+        )
+        source_map = SourceMap(temp_project, config)
+
+        h_file.write_text("/* edited after parsing */\n")
+        assert "int x" in source_map.get_symbol_source_code("Point")
+
+    def test_repomap_cached_until_symbols_change(self, temp_project):
+        """Test that the repo map is reused until the symbols change."""
+        (temp_project / "src" / "test.h").write_text("struct Point { int x; int y; };\n")
+        config = ProjectConfig(
+            project_name="test", library_name="test", project_root=temp_project
+        )
+        source_map = SourceMap(temp_project, config)
+
+        repomap = source_map.generate_repomap()
+        assert source_map.generate_repomap() is repomap
+
+        source_map._add_or_merge_symbol(
+            Symbol(
+                name="Extra",
+                kind="struct",
+                language="c",
+                signature="struct Extra",
+                definition_file=Path("src/test.h"),
+                definition_line=2,
+            )
+        )
+        assert "**Extra**" in source_map.generate_repomap()
+
+    def test_repomap_cached_across_topological_sort(self, temp_project):
+        """Test that ordering symbols does not invalidate the repo map."""
+        (temp_project / "src" / "test.c").write_text(
+            "int helper(int x) { return x; }\nint caller(int x) { return helper(x); }\n"
+        )
+        config = ProjectConfig(
+            project_name="test", library_name="test", project_root=temp_project
+        )
+        source_map = SourceMap(temp_project, config)
+
+        repomap = source_map.generate_repo_map()
+        source_map.get_topological_order()
+        source_map.parse_project()
+        assert source_map.generate_repo_map() is repomap
+
+    def test_fuzz_test_check_sees_file_changes(self, temp_project):
+        """Test that cached fuzz test contents are refreshed when the file changes."""
+        config = ProjectConfig(
+            project_name="test", library_name="test", project_root=temp_project
+        )
+        source_map = SourceMap(temp_project, config)
+        fuzz_file = temp_project / "rust" / "fuzz" / "fuzz_targets" / "fuzz_add.rs"
+
+        assert not source_map.is_fuzz_test_defined(fuzz_file, "add")
+        fuzz_file.write_text("fuzz_target!(|data: &[u8]| { add(data); });\n")
+        assert source_map.is_fuzz_test_defined(fuzz_file, "add")
+        assert not source_map.is_fuzz_test_defined(fuzz_file, "sub")
+        fuzz_file.write_text("// no fuzz target yet\n")
+        assert not source_map.is_fuzz_test_defined(fuzz_file, "add")
+
+
+class TestSourceDiscovery:
+    """Test discovery of source files under the project root."""
+
+    def test_build_dirs_pruned(self, temp_project):
+        """Test that only C/Rust sources are found and build output is skipped."""
+        (temp_project / "src" / "lib.c").write_text("int f(void) { return 0; }\n")
+        (temp_project / "src" / "notes.txt").write_text("not source\n")
+        (temp_project / "rust" / "src" / "lib.rs").write_text("pub fn f() {}\n")
+        (temp_project / "rust" / "target").mkdir()
+        (temp_project / "rust" / "target" / "gen.rs").write_text("pub fn g() {}\n")
+
+        found = {p.relative_to(temp_project) for p in iter_source_files(temp_project, [])}
+        assert found == {Path("src/lib.c"), Path("rust/src/lib.rs")}
+
+    def test_c_ignore_patterns(self, temp_project):
+        """Test that C paths matching an ignore pattern are skipped."""
+        (temp_project / "src" / "lib.c").write_text("int f(void) { return 0; }\n")
+        (temp_project / "src" / "vendored_zlib.c").write_text("int g(void) { return 0; }\n")
+
+        found = {
+            p.relative_to(temp_project) for p in iter_source_files(temp_project, ["zlib"])
+        }
+        assert found == {Path("src/lib.c")}
+
+    def test_c_ignore_patterns_skip_root(self, temp_project):
+        """Test that ignore patterns only match below the project root."""
+        root = temp_project / "libpng"
+        (root / "src").mkdir(parents=True)
+        (root / "src" / "lib.c").write_text("int f(void) { return 0; }\n")
+        (root / "src" / "png_test.c").write_text("int g(void) { return 0; }\n")
+
+        found = {p.relative_to(root) for p in iter_source_files(root, ["png"])}
+        assert found == {Path("src/lib.c")}
+
+
 class TestZopfliSpecificIssues:
     """Test specific issues mentioned in the requirements."""
 